@@ -0,0 +1,228 @@
+'''
+Asset manager of the game.
+Loads the images, sounds and fonts from the images/, sounds/ and font/ directories once and keeps them in a cache.
+Images are converted to the pixel format of the screen, so drawing them does not convert them again every frame.
+The images of the sprites can also be packed into one sprite atlas (see atlas.py).
+Missing files do not stop the game - a placeholder image, a silent sound or the default font is used instead.
+'''
+
+# import libraries
+import os, sys, pygame
+# import the atlas packing images into one surface
+from atlas import SpriteAtlas
+
+# directory of the game with the assets
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# color of the placeholder for missing images
+PLACEHOLDER_COLOR = (255, 0, 255)
+
+
+class NullSound(object):
+    '''
+    Silent sound used when the sound file is missing or the mixer is not available.
+    Has the methods of pygame.mixer.Sound used by the game, which do nothing.
+    '''
+
+    def play(self, *args, **kwargs):
+        '''
+        Method for playing the sound, plays nothing and returns no channel.
+        '''
+        return None
+
+    def stop(self):
+        '''
+        Method for stopping the sound.
+        '''
+        pass
+
+    def set_volume(self, value):
+        '''
+        Setter for the volume, ignored.
+        '''
+        pass
+
+    def get_volume(self):
+        '''
+        Getter for the volume, always 0.
+        '''
+        return 0.0
+
+    def get_length(self):
+        '''
+        Getter for the length of the sound in seconds, always 0.
+        '''
+        return 0.0
+
+
+class AssetManager(object):
+    '''
+    Class loading and caching the assets of the game.
+    Every asset is loaded on its first use, or all at once by preload().
+    '''
+
+    # constructor
+    def __init__(self, root=ROOT):
+        # directory with the images/, sounds/ and font/ directories
+        self._root = root
+        # caches of loaded assets
+        self._images = {}
+        self._variants = {}
+        self._atlases = {}
+        self._sounds = {}
+        self._fonts = {}
+        # names of missing files which were already reported
+        self._missing = set()
+
+    def path(self, directory, name):
+        '''
+        Method for getting the full path of an asset in the given directory.
+        '''
+        return os.path.join(self._root, directory, name)
+
+    def report(self, path, error):
+        '''
+        Method for reporting a missing or broken asset, every asset only once.
+        '''
+        if path not in self._missing:
+            self._missing.add(path)
+            print("Cannot load %s: %s" % (path, error), file=sys.stderr)
+
+    def image(self, name, alpha=True):
+        '''
+        Method for getting an image from the images/ directory.
+        The image is converted to the pixel format of the screen, with per pixel transparency if alpha is True.
+        Conversion needs the screen, so images loaded before pygame.display.set_mode() are converted on the next call.
+        '''
+
+        key = (name, alpha)
+        image = self._images.get(key)
+        # converted image is already in the cache
+        if image is not None and image[1]:
+            return image[0]
+
+        surface = image[0] if image is not None else self._load(name)
+        # convert the image if the screen already exists
+        converted = pygame.display.get_surface() is not None
+        if converted:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        self._images[key] = (surface, converted)
+        return surface
+
+    def _load(self, name):
+        '''
+        Method for loading an image from a file, returns a placeholder when the file cannot be loaded.
+        '''
+
+        path = self.path('images', name)
+        try:
+            return pygame.image.load(path)
+        except (pygame.error, FileNotFoundError) as error:
+            self.report(path, error)
+            surface = pygame.Surface((32, 32))
+            surface.fill(PLACEHOLDER_COLOR)
+            return surface
+
+    def variant(self, name, size=None, angle=0, alpha=True):
+        '''
+        Method for getting a scaled and/or rotated variant of an image.
+        Size is the (width, height) of the variant, angle is the rotation in degrees counterclockwise.
+        Every variant is created only once and kept in the cache.
+        '''
+
+        key = (name, size, angle, alpha)
+        surface = self._variants.get(key)
+        if surface is None:
+            surface = self.image(name, alpha)
+            if size is not None and size != surface.get_size():
+                surface = pygame.transform.smoothscale(surface, size)
+            if angle:
+                surface = pygame.transform.rotate(surface, angle)
+            # cache only variants created from converted images
+            if self._images[(name, alpha)][1]:
+                self._variants[key] = surface
+        return surface
+
+    def atlas(self, names, animations=None):
+        '''
+        Method for getting the sprite atlas of the given images from the images/ directory.
+        Animations are given as a dictionary of lists of image names by the name of the animation.
+        Like the images, the atlas is kept in the cache only once it was converted to the pixel format of the screen.
+        '''
+
+        animations = animations or {}
+        key = (tuple(names), tuple(sorted((name, tuple(frames)) for name, frames in animations.items())))
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            # every frame of the animations is an image of the atlas too
+            names = list(names)
+            for frames in animations.values():
+                names.extend([frame for frame in frames if frame not in names])
+            atlas = SpriteAtlas([(name, self.image(name)) for name in names], animations)
+            if pygame.display.get_surface() is not None:
+                self._atlases[key] = atlas
+        return atlas
+
+    def sound(self, name):
+        '''
+        Method for getting a sound from the sounds/ directory.
+        Returns a NullSound when the file is missing or the mixer is not available.
+        '''
+
+        sound = self._sounds.get(name)
+        # without the mixer return a silent sound, but try to load the file again once the mixer is initialized
+        if sound is None and not pygame.mixer.get_init():
+            return NullSound()
+        if sound is None:
+            path = self.path('sounds', name)
+            try:
+                sound = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError) as error:
+                self.report(path, error)
+                sound = NullSound()
+            self._sounds[name] = sound
+        return sound
+
+    def music(self, name):
+        '''
+        Method for getting the path of a music file from the sounds/ directory, streamed instead of loaded.
+        Returns None when the file is missing.
+        '''
+
+        path = self.path('sounds', name)
+        if not os.path.isfile(path):
+            self.report(path, "No such file")
+            return None
+        return path
+
+    def font(self, name, size):
+        '''
+        Method for getting a font of the given size from the font/ directory.
+        Returns the default font of pygame when the file is missing.
+        '''
+
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            # the fonts are initialized on the first use of a font
+            if not pygame.font.get_init():
+                pygame.font.init()
+            path = self.path('font', name)
+            try:
+                font = pygame.font.Font(path, size)
+            except (pygame.error, FileNotFoundError, OSError) as error:
+                self.report(path, error)
+                font = pygame.font.Font(None, size)
+            self._fonts[key] = font
+        return font
+
+    def preload(self, images=(), sounds=(), fonts=()):
+        '''
+        Method for loading the given assets at once, e.g. before the game starts.
+        Images are given as (name, alpha) pairs, fonts as (name, size) pairs.
+        '''
+        for name, alpha in images:
+            self.image(name, alpha)
+        for name in sounds:
+            self.sound(name)
+        for name, size in fonts:
+            self.font(name, size)
@@ -0,0 +1,95 @@
+'''
+Sprite atlas of the game.
+All images of the sprites are packed into one surface converted to the pixel format of the screen, and every
+sprite is an area of it. A frame is then a list of (atlas, (x, y), area) sprites, drawn by the renderer with
+a single Surface.blits() call instead of one blit per sprite.
+An image may have several animation frames, every frame is an area of the same atlas.
+'''
+
+# import libraries
+import pygame
+
+# pixels left empty around every image, so scaled or filtered areas never bleed into their neighbours
+PADDING = 1
+# maximum width of the atlas, the images are packed in rows (shelves) not wider than this
+MAX_WIDTH = 1024
+# images start and rows of the atlas end on multiples of this number of pixels, SDL blends areas of an atlas
+# with unaligned rows about twice as slow
+ALIGN = 16
+
+
+def _align(x):
+    '''
+    Function rounding x up to a multiple of ALIGN.
+    '''
+    return -(-x // ALIGN) * ALIGN
+
+
+class SpriteAtlas(object):
+    '''
+    Class packing images into one surface.
+    Takes the images as (name, surface) pairs and optionally the animations as a dictionary of lists of
+    image names by the name of the animation. Every image is also an animation with one frame.
+    '''
+
+    # constructor
+    def __init__(self, images, animations=None, maxWidth=MAX_WIDTH):
+        images = list(images)
+        # areas (x, y, width, height) of the images by their names
+        self._areas = {}
+
+        # pack the images into shelves, the highest images first so the shelves waste less space
+        order = sorted(images, key=lambda image: image[1].get_height(), reverse=True)
+        positions = []
+        x = y = shelf = width = 0
+        for name, surface in order:
+            w, h = surface.get_size()
+            # start a new shelf when the image does not fit into the current one
+            if x and x + w + PADDING > maxWidth:
+                x = 0
+                y += shelf + PADDING
+                shelf = 0
+            positions.append((name, surface, x, y))
+            self._areas[name] = (x, y, w, h)
+            x = _align(x + w + PADDING)
+            shelf = max(shelf, h)
+            width = max(width, x)
+
+        # copy the images into the atlas, the maximum of the pixels copies them without blending
+        self._surface = pygame.Surface((max(width, ALIGN), max(y + shelf, 1)), pygame.SRCALPHA)
+        for name, surface, x, y in positions:
+            self._surface.blit(surface, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        # the same pixel format as the screen, so drawing the areas does not convert them again every frame
+        if pygame.display.get_surface() is not None:
+            self._surface = self._surface.convert_alpha()
+
+        # areas of the animation frames by the name of the animation
+        self._frames = dict((name, [area]) for name, area in self._areas.items())
+        for name, frames in (animations or {}).items():
+            self._frames[name] = [self._areas[frame] for frame in frames]
+
+    def getSurface(self):
+        '''
+        Getter for the surface of the atlas.
+        '''
+        return self._surface
+
+    def getArea(self, name, frame=0):
+        '''
+        Getter for the area (x, y, width, height) of an image or of a frame of an animation,
+        the frames repeat from the first one after the last one.
+        '''
+        frames = self._frames[name]
+        return frames[frame % len(frames)]
+
+    def getFrameCount(self, name):
+        '''
+        Getter for the number of frames of an animation, 1 for an image.
+        '''
+        return len(self._frames[name])
+
+    def sprite(self, name, position, frame=0):
+        '''
+        Method for getting the (atlas, (x, y), area) sprite of an image or a frame of an animation.
+        '''
+        return self._surface, position, self.getArea(name, frame)
@@ -0,0 +1,209 @@
+'''
+Audio of the game.
+The mixer is initialized with a small buffer, so sound effects start with a low latency.
+Sound effects play on a pool of channels - a free channel is used when there is one, otherwise the effect
+steals the channel of the oldest effect with a lower (or the same) priority, or is dropped.
+Background music is streamed from the file by pygame.mixer.music and started only once.
+No method waits for anything, so the audio never stalls the loop of the game. Even opening the audio device
+and loading the sound effects can run in the background while the game already shows its first frames,
+until then the effects are dropped and the music starts when the mixer is ready.
+'''
+
+# import libraries
+import sys, threading, pygame
+# import the silent sound used for missing sounds
+from assets import NullSound
+
+# settings of the mixer - frequency, 16 bit signed samples, stereo and the buffer size in samples
+FREQUENCY = 44100
+SAMPLE_SIZE = -16
+CHANNELS = 2
+BUFFER = 512
+# number of channels for the sound effects
+EFFECT_CHANNELS = 8
+
+# priorities of the sound effects, higher priority steals the channels of lower ones
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+
+
+def preInit(frequency=FREQUENCY, size=SAMPLE_SIZE, channels=CHANNELS, buffer=BUFFER):
+    '''
+    Function setting up the mixer before it is initialized.
+    '''
+    pygame.mixer.pre_init(frequency, size, channels, buffer)
+
+
+class AudioManager(object):
+    '''
+    Class playing the sound effects on a pool of channels and streaming the background music.
+    Nothing is played until start() initialized the mixer, or at all without a working mixer.
+    '''
+
+    # constructor
+    def __init__(self, assets, channels=EFFECT_CHANNELS):
+        # manager loading the sounds
+        self._assets = assets
+        # channels of the sound effects, their priorities and the order in which they started playing
+        self._channels = []
+        self._priorities = []
+        self._started = []
+        # number of started sound effects, used for finding the oldest one
+        self._plays = 0
+        # name of the streamed music
+        self._music = None
+        # (name, volume, loops) of the music asked for before the mixer was ready
+        self._wantedMusic = None
+        # number of channels of the sound effects
+        self._numChannels = channels
+        # thread starting the mixer in the background and the lock between it and the game
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self, sounds=()):
+        '''
+        Method for initializing the mixer and loading the given sound effects.
+        A game without sound is still playable, so a mixer that cannot be initialized is only reported.
+        '''
+
+        # initialize the mixer if nothing did before
+        if not pygame.mixer.get_init():
+            try:
+                preInit()
+                pygame.mixer.init()
+            except pygame.error as error:
+                print("Cannot initialize the mixer: %s" % error, file=sys.stderr)
+                return
+        pygame.mixer.set_num_channels(self._numChannels)
+        for name in sounds:
+            self._assets.sound(name)
+
+        # the pool is ready once the channels are set, all lists are complete before that
+        channels = self._numChannels
+        self._priorities = [PRIORITY_LOW] * channels
+        self._started = [0] * channels
+        with self._lock:
+            self._channels = [pygame.mixer.Channel(index) for index in range(channels)]
+            wanted = self._wantedMusic
+
+        # start the music asked for in the meantime
+        if wanted is not None:
+            self.playMusic(*wanted)
+
+    def startInBackground(self, sounds=(), done=None):
+        '''
+        Method for running start() in a background thread, done is called with no arguments when it finished.
+        '''
+
+        def run():
+            self.start(sounds)
+            if done is not None:
+                done()
+        self._thread = threading.Thread(target=run, name='audio', daemon=True)
+        self._thread.start()
+
+    def join(self):
+        '''
+        Method for waiting until the background start finished, called before pygame.quit().
+        '''
+        if self._thread is not None:
+            self._thread.join()
+
+    def isReady(self):
+        '''
+        Method for checking whether the background start finished (or was not used).
+        '''
+        return self._thread is None or not self._thread.is_alive()
+
+    def isEnabled(self):
+        '''
+        Method for checking whether the mixer works.
+        '''
+        return bool(self._channels)
+
+    def _findChannel(self, priority):
+        '''
+        Method for finding the index of the channel for a sound effect of the given priority.
+        Returns a free channel, or the oldest one with the lowest priority not higher than the given one,
+        or None when all channels play more important effects.
+        '''
+
+        best = None
+        for index, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return index
+            if self._priorities[index] > priority:
+                continue
+            if best is None or (self._priorities[index], self._started[index]) < \
+                    (self._priorities[best], self._started[best]):
+                best = index
+        return best
+
+    def play(self, name, priority=PRIORITY_NORMAL, volume=1.0):
+        '''
+        Method for playing a sound effect from the sounds/ directory with the given priority and volume.
+        Returns the channel playing the effect, None when it was dropped.
+        '''
+
+        if not self._channels:
+            return None
+        sound = self._assets.sound(name)
+        if isinstance(sound, NullSound):
+            return None
+        index = self._findChannel(priority)
+        if index is None:
+            return None
+
+        # playing on a busy channel stops its effect
+        channel = self._channels[index]
+        channel.set_volume(volume)
+        channel.play(sound)
+        self._plays += 1
+        self._priorities[index] = priority
+        self._started[index] = self._plays
+        return channel
+
+    def playMusic(self, name, volume=1.0, loops=-1):
+        '''
+        Method for streaming the background music from the sounds/ directory.
+        Music that is already playing only gets the new volume, it is not started again.
+        Music asked for before the mixer is ready starts when it is.
+        '''
+
+        with self._lock:
+            if not self._channels:
+                self._wantedMusic = (name, volume, loops)
+                return
+        if self._music == name and pygame.mixer.music.get_busy():
+            pygame.mixer.music.set_volume(volume)
+            return
+
+        path = self._assets.music(name)
+        if path is None:
+            return
+        try:
+            pygame.mixer.music.load(path)
+        except pygame.error as error:
+            self._assets.report(path, error)
+            return
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops)
+        self._music = name
+
+    def stopMusic(self):
+        '''
+        Method for stopping the background music.
+        '''
+        if self._channels:
+            pygame.mixer.music.stop()
+        self._music = None
+        self._wantedMusic = None
+
+    def stop(self):
+        '''
+        Method for stopping the music and all sound effects.
+        '''
+        if self._channels:
+            pygame.mixer.stop()
+        self.stopMusic()
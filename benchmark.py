@@ -0,0 +1,316 @@
+'''
+Benchmarks of the simulation and rendering of the game.
+Runs with the dummy video and audio drivers of SDL, so it needs no window or sound card.
+Measures ticks per second of the alien movement, laser updates, collision detection (both the batched
+broad phase and AlienState.isCollidingWith on the models), a whole engine tick and rendering of a whole frame,
+for configurable scenarios (rows of aliens, aliens per row, laser projectiles).
+The results can be saved as JSON and compared against a stored baseline, a slowdown over the tolerance
+makes the command fail.
+
+Usage:
+    python benchmark.py --save baseline.json
+    python benchmark.py --baseline baseline.json --tolerance 0.1
+    python benchmark.py --scenario stress --rows 60 --lasers 500
+'''
+
+# use the dummy drivers of SDL before pygame is imported
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# import libraries
+import argparse, json, platform, random, sys, time
+import numpy as np
+import pygame
+# import the parts of the game
+from engine import GameEngine, WIDTH, HEIGHT
+from world import World, ALIEN_SIZE, SPACE_BETWEEN
+from collision import SweepAndPrune
+from formation import Formation, Waves
+from models import AlienState, LaserState
+from renderer import DirtyRenderer
+from assets import AssetManager
+
+# scenarios - rows of aliens, aliens in a row and laser projectiles
+SCENARIOS = {
+    'default': {'rows': 1, 'aliens': 7, 'lasers': 1},
+    'wave': {'rows': 5, 'aliens': 11, 'lasers': 10},
+    'stress': {'rows': 40, 'aliens': 50, 'lasers': 200},
+}
+# default time of one measurement in seconds
+DURATION = 0.5
+# default number of measurements, the best one is kept
+REPEAT = 3
+# default allowed slowdown against the baseline
+TOLERANCE = 0.10
+
+
+def createWorld(scenario, seed=0):
+    '''
+    Function creating a world filled with the aliens and laser projectiles of the scenario.
+    Rows of aliens are placed over each other, wider rows are squeezed into the screen,
+    laser projectiles are spread randomly over the screen.
+    '''
+
+    rng = np.random.default_rng(seed)
+    world = World(WIDTH, HEIGHT)
+    # distance between the aliens in a row, squeezed when the row does not fit into the screen
+    step = min(SPACE_BETWEEN + ALIEN_SIZE, (WIDTH - ALIEN_SIZE - 2) / max(scenario['aliens'], 1))
+    for row in range(scenario['rows']):
+        x = 1 + np.arange(scenario['aliens']) * step
+        # rows over each other, squeezed into the upper part of the screen
+        y = 50 + (row * (HEIGHT - 200)) / max(scenario['rows'], 1)
+        world.addAlienRow(x, y, 0.4 if row % 2 == 0 else -0.4)
+    for x, y in zip(rng.uniform(0, WIDTH, scenario['lasers']), rng.uniform(1, HEIGHT, scenario['lasers'])):
+        world.addLaser(x, y, 20)
+    return world
+
+
+def measure(function, duration, repeat):
+    '''
+    Function calling the function as many times as possible in the given duration, repeated.
+    Returns the best number of calls per second.
+    '''
+    best = 0.0
+    clock = time.perf_counter
+    for _ in range(repeat):
+        calls = 0
+        start = clock()
+        end = start + duration
+        now = start
+        while now < end:
+            # call the function in batches of 10, so the clock is not read too often
+            for _ in range(10):
+                function()
+            calls += 10
+            now = clock()
+        best = max(best, calls / (now - start))
+    return best
+
+
+def createWaves(scenario):
+    '''
+    Function creating one wave of the rows of aliens of the scenario, all spawned at once.
+    '''
+    rows = max(scenario['rows'], 1)
+    return Waves(scenario['aliens'], rows, 1, rows)
+
+
+def benchAlienMovement(scenario):
+    '''
+    Benchmark of one tick of the alien movement - the formation checks the borders, moves down at the edges
+    and moves all aliens.
+    '''
+    world = World(WIDTH, HEIGHT)
+    formation = Formation(world, WIDTH, createWaves(scenario))
+    formation.reset(0.4)
+    aliens = world.getAliens()
+
+    def tick():
+        y = aliens.y[0]
+        formation.update()
+        # keep the aliens on the screen, so the benchmark does not change over time
+        if aliens.y[0] != y:
+            aliens.y[:aliens.getCount()] -= ALIEN_SIZE + SPACE_BETWEEN
+    return tick
+
+
+def benchLaserUpdate(scenario):
+    '''
+    Benchmark of one tick of the laser projectiles - moving, culling and shooting new ones instead of the culled.
+    '''
+    world = createWorld(scenario)
+    lasers = world.getLasers()
+    rng = random.Random(0)
+
+    def tick():
+        world.moveLasers()
+        world.cullLasers()
+        world.flush()
+        # shoot new laser projectiles, so the number of them stays the same
+        for _ in range(scenario['lasers'] - lasers.getAliveCount()):
+            world.addLaser(rng.uniform(0, WIDTH), HEIGHT - 100, 20)
+    return tick
+
+
+def benchCollision(scenario):
+    '''
+    Benchmark of the batched collision detection between all aliens and laser projectiles (without removing them).
+    '''
+    world = createWorld(scenario)
+    aliens, lasers = world.getAliens(), world.getLasers()
+    detection = SweepAndPrune(ALIEN_SIZE)
+    n, m = aliens.getCount(), lasers.getCount()
+
+    def tick():
+        detection.findPairs(aliens.x[:n] + aliens.change[:n], aliens.y[:n], lasers.x[:m], lasers.y[:m])
+    return tick
+
+
+def benchCollisionModels(scenario):
+    '''
+    Benchmark of the collision detection with AlienState.isCollidingWith for every pair of models.
+    '''
+    world = createWorld(scenario)
+    aliens, lasers = world.getAliens(), world.getLasers()
+    alienModels = [AlienState(x, y, WIDTH, HEIGHT - 80, change, SPACE_BETWEEN)
+                   for x, y, change in zip(aliens.x[:aliens.getCount()].tolist(), aliens.y[:aliens.getCount()].tolist(),
+                                           aliens.change[:aliens.getCount()].tolist())]
+    laserModels = [LaserState(x, y, 20) for x, y in zip(lasers.x[:lasers.getCount()].tolist(),
+                                                       lasers.y[:lasers.getCount()].tolist())]
+
+    def tick():
+        for alien in alienModels:
+            for laser in laserModels:
+                alien.isCollidingWith(laser)
+    return tick
+
+
+def benchEngineStep(scenario):
+    '''
+    Benchmark of one whole tick of the engine with random actions and one wave of the rows of aliens of the scenario,
+    the engine restarts when the game ends.
+    '''
+    engine = GameEngine(waves=createWaves(scenario))
+    rng = random.Random(0)
+
+    def tick():
+        if engine.isOver():
+            engine.reset()
+        engine.step(rng.randrange(8))
+    return tick
+
+
+def benchRenderFrame(scenario):
+    '''
+    Benchmark of rendering one whole frame of all aliens and laser projectiles from the sprite atlas with
+    the dirty renderer, the aliens move by one pixel every frame so every frame is different.
+    '''
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    assets = AssetManager()
+    renderer = DirtyRenderer(screen, assets.image('bg.png', alpha=False))
+    atlas = assets.atlas(('alien.png', 'laser.png'))
+    sheet, alienArea, laserArea = atlas.getSurface(), atlas.getArea('alien.png'), atlas.getArea('laser.png')
+    world = createWorld(scenario)
+    ax, ay = [array.tolist() for array in world.getAliens().getPositions()]
+    lx, ly = [array.tolist() for array in world.getLasers().getPositions()]
+    frame = [0]
+
+    def tick():
+        frame[0] += 1
+        shift = frame[0] % 2
+        sprites = [(sheet, (x, y), laserArea) for x, y in zip(lx, ly)]
+        sprites.extend([(sheet, (x + shift, y), alienArea) for x, y in zip(ax, ay)])
+        renderer.render(sprites)
+    return tick
+
+
+# benchmarks by their names
+BENCHMARKS = (
+    ('alien_movement', benchAlienMovement),
+    ('laser_update', benchLaserUpdate),
+    ('collision', benchCollision),
+    ('collision_models', benchCollisionModels),
+    ('engine_step', benchEngineStep),
+    ('render_frame', benchRenderFrame),
+)
+
+
+def run(scenario, names=None, duration=DURATION, repeat=REPEAT):
+    '''
+    Function running the benchmarks (all or the given names) for the scenario.
+    Returns the dictionary of ticks per second by the name of the benchmark.
+    '''
+    results = {}
+    for name, create in BENCHMARKS:
+        if names and name not in names:
+            continue
+        results[name] = measure(create(scenario), duration, repeat)
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    '''
+    Function comparing the results with the baseline.
+    Returns the list of (name, ticks per second, baseline ticks per second, ratio, regression) tuples.
+    '''
+    rows = []
+    for name, value in sorted(results.items()):
+        reference = baseline.get(name)
+        if reference is None:
+            rows.append((name, value, None, None, False))
+            continue
+        ratio = value / reference
+        rows.append((name, value, reference, ratio, ratio < 1.0 - tolerance))
+    return rows
+
+
+def environment():
+    '''
+    Function describing the environment of the benchmark, stored with the results.
+    '''
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pygame': pygame.version.ver,
+            'platform': platform.platform(), 'machine': platform.machine()}
+
+
+# run the benchmarks from the command line
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of Space Invaders.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default='wave', help="preset scenario")
+    parser.add_argument("--rows", type=int, help="rows of aliens (overrides the scenario)")
+    parser.add_argument("--aliens", type=int, help="aliens in a row (overrides the scenario)")
+    parser.add_argument("--lasers", type=int, help="laser projectiles (overrides the scenario)")
+    parser.add_argument("--only", nargs='+', choices=[name for name, create in BENCHMARKS],
+                        help="run only the given benchmarks")
+    parser.add_argument("--duration", type=float, default=DURATION, help="seconds of one measurement")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="measurements of every benchmark, best is kept")
+    parser.add_argument("--save", help="save the results into a JSON file")
+    parser.add_argument("--baseline", help="compare the results with a JSON file saved before")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    pygame.init()
+    scenario = dict(SCENARIOS[args.scenario])
+    for key in ('rows', 'aliens', 'lasers'):
+        if getattr(args, key) is not None:
+            scenario[key] = getattr(args, key)
+
+    # results of a different scenario cannot be compared, refuse them before measuring anything
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get('scenario') != scenario:
+            sys.exit("error: the baseline %s was measured with scenario %s, not %s"
+                     % (args.baseline, baseline.get('scenario'), scenario))
+
+    results = run(scenario, args.only, args.duration, args.repeat)
+    report = {'scenario': scenario, 'environment': environment(), 'results': results}
+
+    # compare with the baseline
+    regressions = []
+    if baseline is not None:
+        print("%-18s %14s %14s %8s" % ('benchmark', 'ticks/s', 'baseline', 'ratio'))
+        for name, value, reference, ratio, regression in compare(results, baseline['results'], args.tolerance):
+            if reference is None:
+                print("%-18s %14.1f %14s %8s" % (name, value, '-', '-'))
+            else:
+                print("%-18s %14.1f %14.1f %7.2fx%s" % (name, value, reference, ratio,
+                                                        '  REGRESSION' if regression else ''))
+            if regression:
+                regressions.append(name)
+    else:
+        print("%-18s %14s" % ('benchmark', 'ticks/s'))
+        for name, value in results.items():
+            print("%-18s %14.1f" % (name, value))
+
+    # save the results
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    pygame.quit()
+    # fail when any benchmark got slower than the tolerance allows
+    if regressions:
+        print("regressions: %s" % ', '.join(regressions), file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,90 @@
+'''
+Collision detection of the game.
+The broad phase sorts one group of entities along the x axis (sweep and prune) and for every entity of the other
+group finds only the entities close enough on the x axis, the narrow phase then compares squared distances
+of these candidates, so no square roots and no check of every pair are needed.
+Detected collisions are returned as arrays of hit pairs, so they can be removed at once after the detection.
+'''
+
+# import libraries
+import numpy as np
+
+
+class SweepAndPrune(object):
+    '''
+    Collision detection of circles with the same radius between two groups of entities.
+    Two entities collide when the distance between their coordinates is smaller than the radius.
+    '''
+
+    # constructor
+    def __init__(self, radius):
+        # distance under which two entities collide
+        self._radius = radius
+        # number of candidate pairs checked by the narrow phase in the last detection
+        self._checks = 0
+
+    def getChecks(self):
+        '''
+        Getter for the number of candidate pairs checked by the narrow phase in the last detection.
+        '''
+        return self._checks
+
+    def findPairs(self, ax, ay, bx, by):
+        '''
+        Method for finding all colliding pairs between the entities a and the entities b.
+        Takes the arrays of x and y coordinates of both groups.
+        Returns two arrays of indices - the index of the entity a and the index of the entity b of every colliding pair,
+        ordered by the index of a and then by the index of b.
+        '''
+
+        self._checks = 0
+        # nothing can collide
+        if len(ax) == 0 or len(bx) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        # broad phase - sort the entities b along the x axis
+        order = np.argsort(bx, kind='stable')
+        sortedX = bx[order]
+        # for every entity a find the range of entities b closer than the radius on the x axis
+        low = np.searchsorted(sortedX, ax - self._radius, side='right')
+        high = np.searchsorted(sortedX, ax + self._radius, side='left')
+        counts = np.maximum(high - low, 0)
+        total = int(counts.sum())
+        self._checks = total
+        # no candidates
+        if total == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        # expand the ranges into candidate pairs
+        first = np.repeat(np.arange(len(ax)), counts)
+        starts = np.cumsum(counts) - counts
+        second = order[np.arange(total) - np.repeat(starts - low, counts)]
+
+        # narrow phase - compare squared distances of the candidates
+        dx = ax[first] - bx[second]
+        dy = ay[first] - by[second]
+        hit = dx * dx + dy * dy < self._radius * self._radius
+        first, second = first[hit], second[hit]
+
+        # order the pairs by a and then by b, so the result does not depend on the sorting
+        pairs = np.lexsort((second, first))
+        return first[pairs], second[pairs]
+
+
+def resolvePairs(first, second):
+    '''
+    Function for selecting the hit pairs in which every entity takes part at most once.
+    The pairs are taken in the given order, a pair is skipped when one of its entities was already used.
+    Returns two arrays of indices of the selected pairs.
+    '''
+
+    usedFirst = set()
+    usedSecond = set()
+    selected = []
+    # only a few pairs collide in a tick, so the pairs are resolved one by one
+    for index, (a, b) in enumerate(zip(first.tolist(), second.tolist())):
+        if a not in usedFirst and b not in usedSecond:
+            usedFirst.add(a)
+            usedSecond.add(b)
+            selected.append(index)
+    return first[selected], second[selected]
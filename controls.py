@@ -0,0 +1,81 @@
+'''
+Input layer of the game.
+Only the events the game uses are let into the event queue, the rest is dropped by SDL before it reaches Python.
+The keys are read with pygame.key.get_pressed() once per tick, so a held key acts in every tick regardless
+of the key repeat of the operating system. Keys pressed and released in between two ticks are remembered
+from their KEYDOWN events, so even the shortest press acts in the next tick.
+When the ticks run on a worker thread, the main thread hands over the state of the keyboard instead,
+as SDL reads the keyboard only on the main thread.
+'''
+
+# import libraries
+import pygame
+# import the actions of the engine
+from engine import ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_FIRE
+
+# the only event types let into the event queue - releases are not needed, the held keys are read from the state
+# of the keyboard, and the screen is drawn again when the window was exposed
+EXPOSE_EVENTS = (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE)
+ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN) + EXPOSE_EVENTS
+# actions of the keys
+KEY_ACTIONS = {
+    pygame.K_LEFT: ACTION_LEFT,
+    pygame.K_RIGHT: ACTION_RIGHT,
+    pygame.K_SPACE: ACTION_FIRE,
+}
+
+
+def allowEvents(types=ALLOWED_EVENTS):
+    '''
+    Function blocking all event types except the given ones, called after the display is created.
+    '''
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(types))
+
+
+class Controls(object):
+    '''
+    Controls of the player, turning the state of the keyboard into the actions of the engine once per tick.
+    '''
+
+    # constructor
+    def __init__(self, keyActions=KEY_ACTIONS):
+        # actions of the keys
+        self._keyActions = dict(keyActions)
+        # actions of the keys pressed since the last tick
+        self._pressed = ACTION_NONE
+        # state of the keyboard handed over by the main thread, None for reading the keyboard in every tick
+        self._keys = None
+
+    def reset(self):
+        '''
+        Method for forgetting the keys pressed before, called when a new game starts.
+        '''
+        self._pressed = ACTION_NONE
+
+    def handleEvent(self, event):
+        '''
+        Method for remembering the keys pressed since the last tick.
+        '''
+        if event.type == pygame.KEYDOWN:
+            self._pressed |= self._keyActions.get(event.key, ACTION_NONE)
+
+    def setKeys(self, keys):
+        '''
+        Setter for the state of the keyboard read by the main thread with pygame.key.get_pressed().
+        '''
+        self._keys = keys
+
+    def poll(self):
+        '''
+        Method for getting the actions of one tick - the actions of the held keys and of the keys pressed
+        since the last tick. Reads the state of the keyboard once, unless the main thread hands it over.
+        '''
+
+        keys = self._keys if self._keys is not None else pygame.key.get_pressed()
+        actions = self._pressed
+        for key, action in self._keyActions.items():
+            if keys[key]:
+                actions |= action
+        self._pressed = ACTION_NONE
+        return actions
@@ -0,0 +1,353 @@
+'''
+Headless engine of the game.
+Runs the logic of the game (ship, aliens, laser projectiles, collisions and score) without a window,
+sound or fonts, so it can be used by bots, regression checks and balancing scripts, and by the game itself.
+
+Usage:
+    engine = GameEngine()
+    engine.reset()
+    while not engine.isOver():
+        events = engine.step(ACTION_LEFT | ACTION_FIRE)
+        state = engine.observe()
+'''
+
+# import libraries
+import random, struct, time, zlib
+import numpy as np
+# import the models of the game
+from models import ShipState, AlienState, LaserState, SHIP_WIDTH
+# import the world storing the aliens and laser projectiles as arrays
+from world import World, SPACE_BETWEEN
+# import the formation and the waves of aliens
+from formation import Formation, Waves, stressWaves
+# import the initial number of slots of the entity pools
+from entities import CAPACITY
+# import the default tick rate of the simulation
+from timestep import TICK_RATE
+# import the profiler that measures nothing
+from profiler import NULL_PROFILER
+
+# actions of the player, combined together as bit flags
+ACTION_NONE = 0
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_FIRE = 4
+
+# events that can happen during one tick
+EVENT_SHOT = 'shot'
+EVENT_ALIEN_KILLED = 'alien_killed'
+EVENT_PLAYER_KILLED = 'player_killed'
+EVENT_WON = 'won'
+EVENT_WAVE = 'wave'
+
+# size of the playing field in pixels
+WIDTH, HEIGHT = 720, 560
+# speed of the aliens in pixels per second
+ALIEN_SPEED = 24
+# speed of the laser projectiles in pixels per second
+LASER_SPEED = 1200
+# speed of the ship while a move action is held in pixels per second
+SHIP_SPEED = 300
+# starting position of the ship
+SHIP_X, SHIP_Y = 310, 460
+# position of a new laser projectile relative to the ship
+LASER_OFFSET_X, LASER_OFFSET_Y = 30, -40
+# points for one killed alien
+POINTS = 5
+# time between two shots in seconds
+FIRE_COOLDOWN = 1.0
+
+
+class GameEngine(object):
+    '''
+    Class defining the headless engine of the game. Behaves as a controller of the models without any view.
+    One call of step() runs one fixed tick of the simulation, with tickRate ticks per second of game time.
+    The aliens and laser projectiles live in the arrays of the World, the ship is a ShipState model.
+    The speeds (in pixels per second), the fire cooldown (in seconds) and the waves can be tuned for balancing,
+    the defaults are the settings of the game.
+    '''
+
+    # constructor
+    def __init__(self, width=WIDTH, height=HEIGHT, tickRate=TICK_RATE, waves=None, alienSpeed=ALIEN_SPEED,
+                 laserSpeed=LASER_SPEED, shipSpeed=SHIP_SPEED, fireCooldown=FIRE_COOLDOWN):
+        # size of the playing field
+        self._width = width
+        self._height = height
+        # number of ticks per second of game time
+        self._tickRate = tickRate
+        # speeds converted from pixels per second to pixels per tick
+        self._alienSpeed = alienSpeed / tickRate
+        self._laserSpeed = laserSpeed / tickRate
+        self._shipSpeed = shipSpeed / tickRate
+        # number of ticks between two shots
+        self._fireCooldown = int(round(fireCooldown * tickRate))
+        # settings and budgets of the waves of aliens
+        waves = Waves() if waves is None else waves
+        # world storing the aliens and laser projectiles, big enough for all alive aliens from the start
+        self._world = World(width, height, max(CAPACITY, waves.maxAlive))
+        # formation moving the aliens and spawning the waves
+        self._formation = Formation(self._world, width, waves)
+        # profiler measuring the collision phase
+        self._profiler = NULL_PROFILER
+
+        # prepare the state of a new game
+        self.reset()
+
+    def reset(self):
+        '''
+        Method for starting a new game.
+        Creates a new ship and the first rows of the first wave of aliens and resets the score.
+        Returns the observation of the new game.
+        '''
+
+        # create a ship (model) as an object of the class ShipState()
+        self._ship = ShipState(SHIP_X, SHIP_Y, self._width, self._shipSpeed)
+        # remove all aliens and laser projectiles of the previous game
+        self._world.clear()
+
+        # number of the current tick
+        self._tick = 0
+        # tick at which the last laser projectile was shot, set so that the ship can shoot right away
+        self._lastShot = -self._fireCooldown - 1
+        # store the score
+        self._score = 0
+        # store the state and the outcome of the game
+        self._over = False
+        self._win = False
+
+        # start the first wave of aliens
+        self._formation.reset(self._alienSpeed)
+
+        return self.observe()
+
+    def step(self, actions=ACTION_NONE):
+        '''
+        Method for running one tick of the simulation.
+        Takes one parameter - actions, the actions of the player in this tick combined from ACTION_* flags.
+        The actions are held keys - the ship moves for every tick with a move action and stops without one.
+        Returns the list of events (EVENT_*) that happened during the tick.
+        '''
+
+        # list of events that happened in this tick
+        events = []
+
+        # finished game does not change anymore
+        if self._over:
+            return events
+
+        world = self._world
+
+        # store the positions from the previous tick for the interpolation when drawing
+        self._ship.savePosition()
+        world.savePositions()
+
+        # handle the actions of the player, both directions at once cancel each other
+        move = actions & (ACTION_LEFT | ACTION_RIGHT)
+        if move == ACTION_LEFT:
+            self._ship.moveLeft()
+        elif move == ACTION_RIGHT:
+            self._ship.moveRight()
+        else:
+            self._ship.stopMove()
+        self._ship.move()
+        # shoot if the cooldown since the last shot has passed
+        if actions & ACTION_FIRE and self._tick - self._lastShot > self._fireCooldown:
+            # store the tick at which the laser projectile was shot
+            self._lastShot = self._tick
+            # create a laser projectile centered above the ship
+            world.addLaser(self._ship.x + LASER_OFFSET_X, self._ship.y + LASER_OFFSET_Y, self._laserSpeed)
+            events.append(EVENT_SHOT)
+
+        self._tick += 1
+
+        # if there are no aliens left
+        formation = self._formation
+        if world.getAliens().getAliveCount() == 0:
+            # spawn the next rows of the wave right away
+            if formation.hasRowsLeft():
+                formation.spawnRows()
+            # or start the next wave
+            elif formation.nextWave():
+                events.append(EVENT_WAVE)
+            # the game is won after the last wave
+            else:
+                self._over = True
+                self._win = True
+                events.append(EVENT_WON)
+                return events
+
+        # move all laser projectiles upwards and remove the ones out of the screen
+        world.moveLasers()
+        world.cullLasers()
+
+        # move the formation of aliens, at the edges of the screen it moves down and spawns the next rows
+        formation.update()
+
+        # remove the aliens hit by laser projectiles, increment score by 5 for each
+        self._profiler.start('collision')
+        killed = world.collideLasers()
+        self._profiler.stop('collision')
+        if killed:
+            self._score += POINTS * killed
+            events.extend([EVENT_ALIEN_KILLED] * killed)
+
+        # collision of an alien with the ship ends the game
+        if world.collidesWithShip(self._ship.x, self._ship.y):
+            self._over = True
+            events.append(EVENT_PLAYER_KILLED)
+
+        # remove aliens that reached the set border of the screen
+        world.cullAliens()
+        # free the slots of all removed aliens and laser projectiles at once
+        world.flush()
+
+        return events
+
+    def observe(self):
+        '''
+        Method for getting the observation of the current state of the game.
+        Returns a dictionary with plain values only, so it can be stored or sent anywhere.
+        '''
+        return {
+            'tick': self._tick,
+            'ship': (self._ship.x, self._ship.y),
+            'aliens': list(zip(*[array.tolist() for array in self._world.getAliens().getPositions()])),
+            'lasers': list(zip(*[array.tolist() for array in self._world.getLasers().getPositions()])),
+            'score': self._score,
+            'wave': self._formation.getWave(),
+            'over': self._over,
+            'win': self._win,
+        }
+
+    def checksum(self):
+        '''
+        Method for getting the CRC-32 checksum of the whole state of the game.
+        Two engines have the same checksum only when their states are the same bit for bit,
+        which is used for checking that a replay reproduces the recorded game.
+        '''
+
+        # tick, score, outcome, the wave and the position of the ship
+        state = struct.pack('<qq??qqdd', self._tick, self._score, self._over, self._win,
+                            self._formation.getWave(), self._formation.getRowsSpawned(),
+                            self._ship.x, self._ship.y)
+        crc = zlib.crc32(state)
+        # coordinates and speeds of all alive aliens and laser projectiles, in the order of their slots
+        for pool in (self._world.getAliens(), self._world.getLasers()):
+            slots = pool.getAliveSlots()
+            for array in (pool.x, pool.y, pool.change):
+                crc = zlib.crc32(np.ascontiguousarray(array[slots]).tobytes(), crc)
+        return crc
+
+    def getShip(self):
+        '''
+        Getter for the model of the ship.
+        '''
+        return self._ship
+
+    def setProfiler(self, profiler):
+        '''
+        Setter for the profiler measuring the collision phase, NULL_PROFILER to measure nothing.
+        '''
+        self._profiler = profiler
+
+    def getFormation(self):
+        '''
+        Getter for the formation of aliens.
+        '''
+        return self._formation
+
+    def getWorld(self):
+        '''
+        Getter for the world storing the aliens and laser projectiles.
+        '''
+        return self._world
+
+    def getAliens(self):
+        '''
+        Getter for the list of models of the aliens.
+        The models are created from the arrays of the world, so changing them does not change the game.
+        '''
+        aliens = self._world.getAliens()
+        slots = aliens.getAliveSlots()
+        return [AlienState(x, y, self._width, self._height-80, change, SPACE_BETWEEN)
+                for x, y, change in zip(aliens.x[slots].tolist(), aliens.y[slots].tolist(),
+                                        aliens.change[slots].tolist())]
+
+    def getLasers(self):
+        '''
+        Getter for the list of models of the laser projectiles.
+        The models are created from the arrays of the world, so changing them does not change the game.
+        '''
+        lasers = self._world.getLasers()
+        slots = lasers.getAliveSlots()
+        return [LaserState(x, y, change)
+                for x, y, change in zip(lasers.x[slots].tolist(), lasers.y[slots].tolist(),
+                                        lasers.change[slots].tolist())]
+
+    def getScore(self):
+        '''
+        Getter for the score.
+        '''
+        return self._score
+
+    def getTick(self):
+        '''
+        Getter for the number of the current tick.
+        '''
+        return self._tick
+
+    def getTickRate(self):
+        '''
+        Getter for the number of ticks per second of game time.
+        '''
+        return self._tickRate
+
+    def isOver(self):
+        '''
+        Method for checking whether the game ended.
+        '''
+        return self._over
+
+    def hasWon(self):
+        '''
+        Method for checking whether the game ended as won.
+        '''
+        return self._win
+
+
+def randomActions(rng):
+    '''
+    Function returning random actions of the player, used for simulated games.
+    '''
+    return rng.randrange(8)
+
+
+# run a batch of simulated games with random actions
+if __name__ == "__main__":
+    # import libraries needed only for the command line
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run simulated games of Space Invaders without a window.")
+    parser.add_argument("--games", type=int, default=100, help="number of games to simulate")
+    parser.add_argument("--max-ticks", type=int, default=36000, help="maximum number of ticks of one game")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random actions")
+    parser.add_argument("--stress", action='store_true', help="play the stress mode with large waves of aliens")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    engine = GameEngine(waves=stressWaves() if args.stress else None)
+    totalTicks = 0
+    totalScore = 0
+    start = time.perf_counter()
+
+    for game in range(args.games):
+        engine.reset()
+        while not engine.isOver() and engine.getTick() < args.max_ticks:
+            engine.step(randomActions(rng))
+        totalTicks += engine.getTick()
+        totalScore += engine.getScore()
+
+    seconds = time.perf_counter() - start
+    print("games: %d, ticks: %d, average score: %.1f" % (args.games, totalTicks, totalScore / args.games))
+    print("%.1f games/s, %.0f ticks/s (%.0fx real time)" % (args.games / seconds, totalTicks / seconds,
+                                                           totalTicks / seconds / engine.getTickRate()))
@@ -0,0 +1,206 @@
+'''
+Entity manager of the game.
+Entities of one type (aliens or laser projectiles) live in pooled slots of NumPy arrays. Every entity gets
+a stable id when it is spawned, so it can be followed across ticks even though the slots are reused.
+Spawning takes slots from a free list and despawning only marks the slots as not alive and queues them,
+the queued slots are returned to the free list at once by flush() at the end of the tick.
+Both are O(1) per entity, nothing is moved in the arrays and the order of the slots stays deterministic.
+'''
+
+# import libraries
+import numpy as np
+
+# initial number of slots in the arrays
+CAPACITY = 64
+
+
+class EntityPool(object):
+    '''
+    Pool of entities of one type stored as a structure of arrays.
+    Every entity has the stable id, the x and y coordinates, the coordinates from the previous tick,
+    the change of coordinates (speed) and the alive flag.
+    Only the first getCount() slots of the arrays were ever used, the arrays grow by doubling when they are full.
+    The arrays can be read directly, but only the slots with the alive flag hold entities.
+    '''
+
+    # names and types of the arrays of the pool
+    _fields = (('id', np.int64), ('x', np.float64), ('y', np.float64), ('prevX', np.float64),
+               ('prevY', np.float64), ('change', np.float64), ('alive', bool))
+
+    # constructor
+    def __init__(self, capacity=CAPACITY):
+        # create the arrays
+        for name, dtype in self._fields:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        # id given to the next spawned entity
+        self._nextId = 0
+        # prepare the empty pool
+        self.clear()
+
+    def clear(self):
+        '''
+        Method for removing all entities. The ids keep growing, so they are never repeated.
+        '''
+
+        # number of slots that were ever used
+        self._count = 0
+        # number of alive entities
+        self._aliveCount = 0
+        # stack of free slots below _count
+        self._free = []
+        # arrays of despawned slots waiting for the end of the tick
+        self._pending = []
+        self.alive[:] = False
+
+    def getCount(self):
+        '''
+        Getter for the number of slots that were ever used, all alive entities are in the slots below it.
+        '''
+        return self._count
+
+    def getAliveCount(self):
+        '''
+        Getter for the number of alive entities.
+        '''
+        return self._aliveCount
+
+    def getAliveMask(self):
+        '''
+        Getter for the array of alive flags of the used slots.
+        '''
+        return self.alive[:self._count]
+
+    def getAliveSlots(self):
+        '''
+        Getter for the array of slots of all alive entities, in the order of the slots.
+        '''
+        return np.flatnonzero(self.alive[:self._count])
+
+    def getIds(self):
+        '''
+        Getter for the array of ids of all alive entities.
+        '''
+        return self.id[:self._count][self.alive[:self._count]]
+
+    def _reserve(self, needed):
+        '''
+        Method for making sure the arrays have at least the needed number of slots.
+        '''
+
+        capacity = len(self.x)
+        # arrays are big enough
+        if needed <= capacity:
+            return
+        # double the capacity until the needed number of slots fits
+        while capacity < needed:
+            capacity *= 2
+        for name, dtype in self._fields:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+    def _allocate(self, number):
+        '''
+        Method for taking the given number of slots, first from the free list and then from the end of the arrays.
+        '''
+
+        # take the most recently freed slots from the free list
+        reused = min(number, len(self._free))
+        slots = self._free[len(self._free) - reused:]
+        del self._free[len(self._free) - reused:]
+
+        # take the rest from the end of the arrays
+        fresh = number - reused
+        if fresh:
+            self._reserve(self._count + fresh)
+            slots.extend(range(self._count, self._count + fresh))
+            self._count += fresh
+
+        return np.array(slots, dtype=np.intp)
+
+    def spawn(self, x, y, change):
+        '''
+        Method for spawning entities.
+        x and y can be single numbers or arrays of coordinates, change is shared by all spawned entities.
+        Returns the array of ids of the spawned entities.
+        '''
+
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y = np.broadcast_to(np.asarray(y, dtype=np.float64), x.shape)
+        number = len(x)
+        slots = self._allocate(number)
+        ids = np.arange(self._nextId, self._nextId + number, dtype=np.int64)
+        self._nextId += number
+
+        # new entities have no previous position, so the previous coordinates are the current ones
+        self.id[slots] = ids
+        self.x[slots] = x
+        self.y[slots] = y
+        self.prevX[slots] = x
+        self.prevY[slots] = y
+        self.change[slots] = change
+        self.alive[slots] = True
+        self._aliveCount += number
+
+        return ids
+
+    def despawn(self, slots):
+        '''
+        Method for despawning the entities in the given slots.
+        The entities stop being alive right away, their slots are freed by flush() at the end of the tick.
+        Returns the number of despawned entities.
+        '''
+
+        # despawn only alive entities, every one of them only once
+        slots = np.asarray(slots, dtype=np.intp)
+        slots = slots[self.alive[slots]]
+        if len(slots) == 0:
+            return 0
+        slots = np.unique(slots)
+
+        self.alive[slots] = False
+        self._aliveCount -= len(slots)
+        self._pending.append(slots)
+        return len(slots)
+
+    def kill(self, mask):
+        '''
+        Method for despawning entities selected by a mask.
+        Takes one parameter - mask, the boolean array over the used slots with True for the entities to be removed.
+        Returns the number of despawned entities.
+        '''
+        return self.despawn(np.flatnonzero(mask & self.alive[:self._count]))
+
+    def flush(self):
+        '''
+        Method for returning the slots of all entities despawned during the tick to the free list.
+        '''
+        for slots in self._pending:
+            self._free.extend(slots.tolist())
+        self._pending = []
+
+    def savePositions(self):
+        '''
+        Method for storing the current coordinates as the coordinates of the previous tick.
+        '''
+        n = self._count
+        self.prevX[:n] = self.x[:n]
+        self.prevY[:n] = self.y[:n]
+
+    def getPositions(self):
+        '''
+        Getter for the arrays of x and y coordinates of all alive entities.
+        '''
+        mask = self.alive[:self._count]
+        return self.x[:self._count][mask], self.y[:self._count][mask]
+
+    def getInterpolatedPositions(self, alpha):
+        '''
+        Method for getting the coordinates of all alive entities in between the previous and the current tick.
+        Alpha is the fraction of the tick, 0 for the previous and 1 for the current coordinates.
+        '''
+        n = self._count
+        mask = self.alive[:n]
+        prevX, prevY = self.prevX[:n][mask], self.prevY[:n][mask]
+        return prevX + (self.x[:n][mask] - prevX) * alpha, prevY + (self.y[:n][mask] - prevY) * alpha
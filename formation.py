@@ -0,0 +1,242 @@
+'''
+Formation and waves of aliens.
+All aliens move together as one formation - every alien moves by the same change of x coordinates, which the
+formation turns around for all of them at once at the edges of the screen. So checking the borders of the screen
+does not look at every alien - the formation keeps the slots of its leftmost and rightmost alive aliens,
+finds them again only after aliens were killed or spawned, and checks only these two.
+The rows of aliens come in waves with explicit budgets - the number of rows of a wave, the number of rows
+spawned at once and the maximum number of alive aliens, so the number of entities (and the cost of a tick)
+never grows without bound. The stress mode uses the same budgets with much larger numbers.
+'''
+
+# import libraries
+import numpy as np
+# import the sizes of the aliens
+from world import ALIEN_SIZE, SPACE_BETWEEN
+
+# number of aliens in a row
+NUM_ALIENS = 7
+# number of rows of aliens in one wave
+WAVE_ROWS = 6
+# number of waves, the game is won after the last one
+WAVES = 3
+# speed of every next wave compared to the previous one
+WAVE_SPEEDUP = 1.25
+# y coordinate of new rows of aliens
+TOP = 50
+# distance between two rows of aliens (and the distance the formation moves down at the edges)
+ROW_HEIGHT = ALIEN_SIZE + SPACE_BETWEEN
+# largest part of the width of the screen taken by one row, wider rows are squeezed to leave the formation room to move
+ROW_FILL = 0.75
+
+# budgets of the stress mode - aliens in a row, rows of a wave, rows spawned at once and alive aliens
+STRESS_ALIENS = 40
+STRESS_ROWS = 100
+STRESS_ROWS_PER_SPAWN = 5
+STRESS_MAX_ALIVE = 1500
+
+
+class Waves(object):
+    '''
+    Settings and budgets of the waves of aliens.
+    '''
+
+    # constructor
+    def __init__(self, numAliens=NUM_ALIENS, rows=WAVE_ROWS, waves=WAVES, rowsPerSpawn=1, maxAlive=None,
+                 speedup=WAVE_SPEEDUP):
+        # number of aliens in a row
+        self.numAliens = numAliens
+        # number of rows of one wave
+        self.rows = rows
+        # number of waves
+        self.waves = waves
+        # number of rows spawned at once
+        self.rowsPerSpawn = rowsPerSpawn
+        # maximum number of alive aliens, a whole wave by default
+        self.maxAlive = rows * numAliens if maxAlive is None else maxAlive
+        # speed of every next wave compared to the previous one
+        self.speedup = speedup
+
+        if numAliens < 1 or rows < 1 or waves < 1 or rowsPerSpawn < 1:
+            raise ValueError("waves need at least one alien, row, wave and row per spawn")
+        if self.maxAlive < rowsPerSpawn * numAliens:
+            raise ValueError("maximum of alive aliens (%d) is lower than one spawn (%d)"
+                             % (self.maxAlive, rowsPerSpawn * numAliens))
+
+
+def stressWaves(numAliens=STRESS_ALIENS, rows=STRESS_ROWS, rowsPerSpawn=STRESS_ROWS_PER_SPAWN,
+                maxAlive=STRESS_MAX_ALIVE):
+    '''
+    Function creating the waves of the stress mode - wide rows of aliens spawned several at once,
+    bounded by the maximum number of alive aliens.
+    '''
+    return Waves(numAliens, rows, 1, rowsPerSpawn, maxAlive, 1.0)
+
+
+class Formation(object):
+    '''
+    Formation of all aliens of the world.
+    Moves the aliens with one shared speed, moves them down and turns them around at the edges of the screen,
+    spawns the rows of the waves within their budgets and starts the next wave when one is cleared.
+    '''
+
+    # constructor
+    def __init__(self, world, width, waves=None):
+        # world storing the aliens
+        self._world = world
+        # width of the screen
+        self._maxX = width
+        # settings and budgets of the waves
+        self._waves = Waves() if waves is None else waves
+        # distance between two aliens in a row, squeezed when the row is too wide for the screen
+        self._spacing = min(ROW_HEIGHT, width * ROW_FILL / self._waves.numAliens)
+
+    def getWaves(self):
+        '''
+        Getter for the settings and budgets of the waves.
+        '''
+        return self._waves
+
+    def reset(self, speed):
+        '''
+        Method for starting the first wave with the given speed (change of x coordinates per tick).
+        '''
+
+        # number of the current wave, starting with 0
+        self._wave = 0
+        # number of rows of the current wave spawned so far
+        self._rowsSpawned = 0
+        # speed of the first wave
+        self._speed = speed
+        # shared speed (change of x coordinates per tick) of the formation
+        self._change = speed
+        # slots of the alive aliens with the lowest and highest x coordinate,
+        # valid while the number of alive aliens stays _known
+        self._left = 0
+        self._right = 0
+        self._known = -1
+
+        self.spawnRows()
+
+    def getWave(self):
+        '''
+        Getter for the number of the current wave, starting with 0.
+        '''
+        return self._wave
+
+    def getRowsSpawned(self):
+        '''
+        Getter for the number of rows of the current wave spawned so far.
+        '''
+        return self._rowsSpawned
+
+    def getChange(self):
+        '''
+        Getter for the shared change of x coordinates of the formation per tick.
+        '''
+        return self._change
+
+    def hasRowsLeft(self):
+        '''
+        Method for checking whether the current wave has rows left to spawn.
+        '''
+        return self._rowsSpawned < self._waves.rows
+
+    def isCleared(self):
+        '''
+        Method for checking whether all rows of the current wave were spawned and all aliens are gone.
+        '''
+        return not self.hasRowsLeft() and self._world.getAliens().getAliveCount() == 0
+
+    def nextWave(self):
+        '''
+        Method for starting the next wave, faster than the previous one.
+        Returns False when the last wave was already played.
+        '''
+
+        if self._wave + 1 >= self._waves.waves:
+            return False
+        self._wave += 1
+        self._rowsSpawned = 0
+        # keep the direction of the formation, only the speed grows
+        speed = abs(self._speed) * self._waves.speedup ** self._wave
+        self._change = speed if self._change > 0 else -speed
+        self.spawnRows()
+        return True
+
+    def spawnRows(self):
+        '''
+        Method for spawning the next rows of the current wave within the budgets.
+        The rows start at the edge of the screen the formation moves away from. When the row budget is spent,
+        or the new rows would exceed the maximum of alive aliens, nothing is spawned.
+        Returns the number of spawned aliens.
+        '''
+
+        waves = self._waves
+        rows = min(waves.rowsPerSpawn, waves.rows - self._rowsSpawned)
+        aliens = self._world.getAliens()
+        if rows <= 0 or aliens.getAliveCount() + rows * waves.numAliens > waves.maxAlive:
+            return 0
+
+        # x coordinates of the aliens relative to the first one
+        offsets = np.arange(waves.numAliens) * self._spacing
+        # if the formation is moving to the right, start at the left edge of the screen
+        if self._change > 0:
+            x = 1 + offsets
+        # if the formation is moving to the left, start at the right edge of the screen
+        else:
+            x = self._maxX - waves.numAliens * self._spacing + (self._spacing - ALIEN_SIZE) + offsets
+
+        # rows spawned at once share the height of one row
+        for row in range(rows):
+            self._world.addAlienRow(x, TOP + row * ROW_HEIGHT / float(rows), self._change)
+        self._rowsSpawned += rows
+        # the extents have to be computed again
+        self._known = -1
+        return rows * waves.numAliens
+
+    def _updateExtents(self):
+        '''
+        Method for finding the slots of the leftmost and rightmost alive aliens,
+        only when aliens were killed or spawned since the last time.
+        All aliens move by the same change, so the same aliens stay the leftmost and rightmost ones.
+        '''
+
+        aliens = self._world.getAliens()
+        alive = aliens.getAliveCount()
+        if alive == self._known:
+            return
+        self._known = alive
+        if alive:
+            slots = aliens.getAliveSlots()
+            x = aliens.x[slots]
+            self._left = int(slots[x.argmin()])
+            self._right = int(slots[x.argmax()])
+
+    def withinBordersX(self):
+        '''
+        Method for checking whether the whole formation is within set boundaries after its next move.
+        '''
+        self._updateExtents()
+        x = self._world.getAliens().x
+        return x[self._left] > 0 and x[self._right] + ALIEN_SIZE + self._change < self._maxX
+
+    def update(self):
+        '''
+        Method for moving the formation by one tick.
+        At the edge of the screen the formation moves a row lower, changes its direction and the next rows
+        of the wave are spawned.
+        '''
+
+        world = self._world
+        # if the whole formation is within the screen, move it
+        if self.withinBordersX():
+            world.moveAliens()
+        # if the formation reaches the edge of the screen
+        else:
+            # move all aliens a row lower, change their direction and move them
+            world.moveAliensDown()
+            self._change = -self._change
+            world.moveAliens()
+            # spawn the next rows of the wave moving the same way
+            self.spawnRows()
@@ -0,0 +1,367 @@
+'''
+Models of the game - the ship, the aliens and the laser projectiles.
+The models do not depend on pygame, so they can be used without a window (see engine.py).
+The models keep their state in __slots__ instead of a dictionary per object, and constants shared by all
+objects of a type (size, width, borders and space between aliens) are stored once per type, not in every object.
+The coordinates are the public x and y attributes, read directly in hot loops, the getters stay for compatibility.
+'''
+
+# width of the ship in pixels
+SHIP_WIDTH = 75
+
+
+class ShipState(object):
+    '''
+    Model for Ship.
+    State of ship that is being moved based on user interactions.
+    Maintains the information that describes the position of the ship, its maximal x coordinate,
+    its change of coordinates (speed) per tick and its current velocity.
+    Contains methods for getting x and y coordinates and handling the movement - the controls set the velocity
+    and move() moves the ship by it once per tick, so a held key moves the ship smoothly.
+    '''
+
+    # attributes of every ship - coordinates, coordinates from the previous tick, maximum allowed value
+    # for x coordinate, change of the coordinates (speed) per tick and the current velocity
+    __slots__ = ('x', 'y', '_prevX', '_prevY', '_maxX', '_shipChange', '_velocity')
+
+    # width, the same for every ship
+    _width = SHIP_WIDTH
+
+    # constructor
+    def __init__(self, xpos, ypos, maxxpos, change):
+        # set the instance attributes
+        # x coordinate 
+        self.x = xpos
+        # y coordinate
+        self.y = ypos
+        # coordinates from the previous tick (used for interpolation when drawing)
+        self._prevX = xpos
+        self._prevY = ypos
+        # maximum allowed value for x coordinate
+        self._maxX = maxxpos
+        # change of the coordinates (speed) per tick
+        self._shipChange = change
+        # current change of the x coordinate per tick, negative to the left and positive to the right
+        self._velocity = 0
+
+    def getXPos(self):
+        '''
+        Getter for x coordinate returning the value of x coordinate of an object.
+        '''
+        return self.x
+
+    def getYPos(self):
+        '''
+        Getter for y coordinate returning the value of y coordinate of an object.
+        '''
+        return self.y
+
+    def savePosition(self):
+        '''
+        Method for storing the current coordinates as the coordinates of the previous tick.
+        Called at the beginning of every tick of the simulation.
+        '''
+        self._prevX = self.x
+        self._prevY = self.y
+
+    def getInterpolatedPos(self, alpha):
+        '''
+        Method for getting the coordinates in between the previous and the current tick.
+        Alpha is the fraction of the tick, 0 for the previous and 1 for the current coordinates.
+        '''
+        prevX = self._prevX
+        prevY = self._prevY
+        return prevX + (self.x - prevX) * alpha, prevY + (self.y - prevY) * alpha
+
+    
+    def getVelocity(self):
+        '''
+        Getter for the current change of the x coordinate per tick.
+        '''
+        return self._velocity
+
+    def moveLeft(self):
+        '''
+        Method for moving object to the left by setting its velocity, the ship moves in move().
+        Triggered by holding the left arrow in controller.
+        '''
+        self._velocity = -self._shipChange
+
+    def moveRight(self):
+        '''
+        Method for moving object to the right by setting its velocity, the ship moves in move().
+        Triggered by holding the right arrow in controller.
+        '''
+        self._velocity = self._shipChange
+
+    def stopMove(self):
+        '''
+        Method for stopping the movement of an object.
+        Triggered by releasing the arrows in controller.
+        '''
+        self._velocity = 0
+
+    def move(self):
+        '''
+        Method for moving object by its velocity, called once per tick.
+        '''
+
+        # if the new x coordinate is more than 0 and the new right edge is less than maximum allowed value
+        # of x coordinate (= is within the screen borders)
+        x = self.x + self._velocity
+        if x > 0 and x + self._width < self._maxX:
+            # change the x coordinate by the velocity
+            self.x = x
+
+class AlienKind(object):
+    '''
+    Constants shared by the aliens of one formation - the maximum allowed values for x and y coordinates
+    and the space between two aliens. Every combination of them exists only once.
+    '''
+
+    __slots__ = ('maxX', 'maxY', 'spaceBetween')
+
+    # every created kind by its constants
+    _kinds = {}
+
+    # constructor
+    def __init__(self, maxX, maxY, spaceBetween):
+        self.maxX = maxX
+        self.maxY = maxY
+        self.spaceBetween = spaceBetween
+
+    @classmethod
+    def get(cls, maxX, maxY, spaceBetween):
+        '''
+        Method for getting the shared kind with the given constants, created on its first use.
+        '''
+        key = (maxX, maxY, spaceBetween)
+        kind = cls._kinds.get(key)
+        if kind is None:
+            kind = cls._kinds[key] = cls(maxX, maxY, spaceBetween)
+        return kind
+
+class AlienState(object):
+    '''
+    Model for Alien.
+    State of alien that is being moved on the screen.
+    Maintains the information that describes the position of the alien, its maximal x and y coordinates,
+    its change of coordinates (speed) and the space between two aliens.
+    Contains methods for getting x and y coordinates, handling movement, checking whether the coordinates
+    are within set boundaries and handling collision
+    The borders and the space between aliens are the same for a whole formation, so they are kept once
+    in a shared AlienKind instead of in every alien.
+    '''
+
+    # attributes of every alien - coordinates, coordinates from the previous tick, change of coordinates (speed)
+    # and the kind holding the constants shared by the aliens
+    __slots__ = ('x', 'y', '_prevX', '_prevY', '_alienChange', '_kind')
+
+    # size, the same for every alien
+    _size = 40
+
+    # constructor
+    def __init__(self, xpos, ypos, maxxpos, maxypos, xchange, space):
+        # set instance attributes
+        # x coordinate
+        self.x = xpos
+        # y coordinate
+        self.y = ypos
+        # coordinates from the previous tick (used for interpolation when drawing)
+        self._prevX = xpos
+        self._prevY = ypos
+        # change of coordinates (speed)
+        self._alienChange = xchange
+        # maximum allowed values for x and y coordinates and the space between two aliens, shared by all aliens
+        self._kind = AlienKind.get(maxxpos, maxypos, space)
+
+    @property
+    def _maxX(self):
+        '''
+        Maximum allowed value for x coordinate.
+        '''
+        return self._kind.maxX
+
+    @property
+    def _maxY(self):
+        '''
+        Maximum allowed value for y coordinate.
+        '''
+        return self._kind.maxY
+
+    @property
+    def _spaceBetween(self):
+        '''
+        Space between two aliens.
+        '''
+        return self._kind.spaceBetween
+
+    def getXPos(self):
+        '''
+        Getter for x coordinate returning the value of x coordinate of an object.
+        '''
+        return self.x
+
+    def getYPos(self):
+        '''
+        Getter for y coordinate returning the value of y coordinate of an object.
+        '''
+        return self.y
+
+    def savePosition(self):
+        '''
+        Method for storing the current coordinates as the coordinates of the previous tick.
+        Called at the beginning of every tick of the simulation.
+        '''
+        self._prevX = self.x
+        self._prevY = self.y
+
+    def getInterpolatedPos(self, alpha):
+        '''
+        Method for getting the coordinates in between the previous and the current tick.
+        Alpha is the fraction of the tick, 0 for the previous and 1 for the current coordinates.
+        '''
+        prevX = self._prevX
+        prevY = self._prevY
+        return prevX + (self.x - prevX) * alpha, prevY + (self.y - prevY) * alpha
+
+    def getChange(self):
+        '''
+        Getter for the change of coordinates returning the value of the change of coordinates of an object.
+        '''
+        return self._alienChange
+
+    def withinBordersX(self):
+        '''
+        Method for checking whether the x coordinate is within set boundaries.
+        X coordinate cannot be 'out of the screen', therefore lower than 0 and higher than screen's width.
+        '''
+        
+        # check if x coordinate + size + change of coordinates is lower than the maximum allowed x value
+        # and if the x coordinate is higher than 0
+        x = self.x
+        if x + self._size + self._alienChange < self._kind.maxX and x > 0:
+            # return True
+            return True 
+
+    def outOfBorderY(self):
+        '''
+        Method for checking whether the y coordinates are within the set boundaries.
+        Alien cannot go below the ship, so the y coordinates cannot be lower than the ship's.
+        '''
+
+        # check if y coordinate is higher than the maximum allowed value for y coordinate
+        if self.y > self._kind.maxY:
+            # return True
+            return True
+
+    def move(self):
+        '''
+        Method for defining the movement of an alien.
+        '''
+        
+        # increment the x coordinate by the change of coordinates (speed)
+        self.x += self._alienChange
+    
+    def moveDown(self):
+        '''
+        Method for defining the movement downward of an alien.
+        Happens when the alien reaches the edge of the screen and has to be moved a row lower.
+        '''
+
+        # increment the y coordinate by the size of an alien and the space between two aliens
+        self.y += self._size + self._kind.spaceBetween
+        # change the direction of alien movement
+        # set the change of coordinates to its opposite value
+        self._alienChange = -self._alienChange
+
+    def isCollidingWith(self, object):
+        '''
+        Method for checking the collisions between alien and other object passed in.
+        The object is any object with the getXPos() and getYPos() getters, not only a model of the game.
+        '''
+
+        # calculate the distance between alien and object, compared squared to avoid the square root
+        dx = self.x + self._alienChange - object.getXPos()
+        dy = self.y - object.getYPos()
+
+        # if the distance is smaller than the size of an alien, collision happened
+        return dx * dx + dy * dy < self._size * self._size
+
+    
+class LaserState(object):    # model
+    '''
+    Model for Laser.
+    State of laser that is being moved ('shot') on the screen.
+    Maintains the information that describes the position of the laser projectile and its change of coordinates (speed).
+    Contains methods for getting x and y coordinates, handling movement (shooting), and checking whether the y coordinate
+    is within set boundaries.
+    The laser projectile shouldn't get 'out of the screen', so its y coordinate can't go under 0.
+    '''
+
+    # attributes of every laser projectile - coordinates, coordinates from the previous tick
+    # and change of coordinates (speed)
+    __slots__ = ('x', 'y', '_prevX', '_prevY', '_laserChange')
+
+    # constructor
+    def __init__(self, xpos, ypos, change):
+        # set instance attributes
+        # x coordinate
+        self.x = xpos
+        # y coordinate
+        self.y = ypos
+        # coordinates from the previous tick (used for interpolation when drawing)
+        self._prevX = xpos
+        self._prevY = ypos
+        # change of coordinates (speed)
+        self._laserChange = change
+
+    def getXPos(self):
+        '''
+        Getter for x coordinate returning the value of x coordinate of an object.
+        '''
+        return self.x
+
+    def getYPos(self):
+        '''
+        Getter for y coordinate returning the value of y coordinate of an object.
+        '''
+        return self.y
+
+    def savePosition(self):
+        '''
+        Method for storing the current coordinates as the coordinates of the previous tick.
+        Called at the beginning of every tick of the simulation.
+        '''
+        self._prevX = self.x
+        self._prevY = self.y
+
+    def getInterpolatedPos(self, alpha):
+        '''
+        Method for getting the coordinates in between the previous and the current tick.
+        Alpha is the fraction of the tick, 0 for the previous and 1 for the current coordinates.
+        '''
+        prevX = self._prevX
+        prevY = self._prevY
+        return prevX + (self.x - prevX) * alpha, prevY + (self.y - prevY) * alpha
+
+    def inScreen(self):
+        '''
+        Method for checking whether the y coordinates are within the set boundaries.
+        Laser projectile cannot get higher than the upper edge of the screen (0).
+        '''
+
+        # check if y coordinate is higher than 0
+        if self.y > 0:
+            # return True
+            return True   
+
+    def shoot(self):
+        '''
+        Method for 'shooting' the laser projectile. 
+        Happens by decrementing the y coordinate to move upwards on the screen.
+        Triggered by space in controller.
+        '''
+
+        # decrement the y coordinate by the change of coordinates (speed)
+        self.y -= self._laserChange
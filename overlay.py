@@ -0,0 +1,91 @@
+'''
+In-game overlay showing the measurements of the frame profiler.
+The overlay is put together only a few times per second, so showing it barely changes what it measures.
+'''
+
+# import libraries
+import time, pygame
+# import the phases measured by the profiler
+from profiler import PHASES, HISTOGRAM_STEP
+
+# number of seconds between two refreshes of the overlay
+REFRESH = 0.5
+# colors of the overlay
+TEXT_COLOR = (255, 255, 0)
+BAR_COLOR = (0, 255, 0)
+BACKGROUND_COLOR = (0, 0, 0, 160)
+# height of the histogram in pixels
+HISTOGRAM_HEIGHT = 40
+
+
+class ProfilerOverlay(object):
+    '''
+    Overlay drawn in the top right corner of the screen.
+    Shows the frame rate, the p50/p95/p99 of frame and work times, average times of the phases,
+    counts of entities and collision checks and the histogram of work times.
+    '''
+
+    # constructor
+    def __init__(self, font, screenWidth):
+        # font of the texts
+        self._font = font
+        # width of the screen for placing the overlay
+        self._screenWidth = screenWidth
+        # last put together surface and the time of the refresh
+        self._surface = None
+        self._refreshed = 0.0
+
+    def getSprite(self, profiler):
+        '''
+        Method for getting the (surface, (x, y)) sprite of the overlay for the given profiler.
+        '''
+
+        now = time.perf_counter()
+        if self._surface is None or now - self._refreshed >= REFRESH:
+            self._surface = self._build(profiler)
+            self._refreshed = now
+        return self._surface, (self._screenWidth - self._surface.get_width() - 10, 10)
+
+    def _build(self, profiler):
+        '''
+        Method for putting together the surface of the overlay.
+        '''
+
+        frame50, frame95, frame99 = profiler.getPercentiles()
+        work50, work95, work99 = profiler.getPercentiles(work=True)
+        averages = profiler.getAverages()
+        counts = profiler.getLastFrame().get('counts', {})
+
+        lines = [
+            'FPS %.0f' % (1000.0 / frame50 if frame50 else 0.0),
+            'frame p50 %.1f p95 %.1f p99 %.1f ms' % (frame50, frame95, frame99),
+            'work  p50 %.1f p95 %.1f p99 %.1f ms' % (work50, work95, work99),
+        ]
+        lines.extend('%-9s %.2f ms' % (phase, averages[phase]) for phase in PHASES)
+        lines.append('ticks %d aliens %d lasers %d' % (counts.get('ticks', 0), counts.get('aliens', 0),
+                                                      counts.get('lasers', 0)))
+        lines.append('collision checks %d' % counts.get('collision_checks', 0))
+        lines.append('work time histogram, %g ms per bar' % HISTOGRAM_STEP)
+
+        texts = [self._font.render(line, True, TEXT_COLOR) for line in lines]
+        histogram = profiler.getHistogram()
+        barWidth = 6
+        width = max(max(text.get_width() for text in texts), barWidth * len(histogram)) + 10
+        lineHeight = self._font.get_linesize()
+        height = lineHeight * len(texts) + HISTOGRAM_HEIGHT + 15
+
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill(BACKGROUND_COLOR)
+        y = 5
+        for text in texts:
+            surface.blit(text, (5, y))
+            y += lineHeight
+
+        # bars of the histogram of work times, HISTOGRAM_STEP milliseconds per bar
+        most = max(histogram) or 1
+        bottom = height - 5
+        for index, number in enumerate(histogram):
+            barHeight = int(HISTOGRAM_HEIGHT * number / most)
+            if barHeight:
+                surface.fill(BAR_COLOR, (5 + index * barWidth, bottom - barHeight, barWidth - 1, barHeight))
+        return surface
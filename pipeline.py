@@ -0,0 +1,180 @@
+'''
+Pipelined simulation of the frames.
+Without the pipeline, the loop of the game handles the events, runs the simulation, draws the frame and shows it
+one after another, so a slow pygame.display.update() (or a wait for the vertical sync) delays the next tick.
+With the pipeline, the simulation (updating the scene and taking the sprites of the frame) runs on a worker
+thread and produces immutable snapshots of the frames, while the main thread keeps handling the events of
+the window and drawing and showing the latest snapshot. All calls of the SDL video subsystem (events, icon,
+drawing on the screen and presenting it) stay on the main thread, as some systems (macOS) require.
+Frames are handed over through a double buffer - one frame is being presented and at most one waits for it.
+When the presentation falls behind, a newer frame replaces the waiting one, so the simulation never waits for
+the presentation and the screen always shows its latest state.
+'''
+
+# import libraries
+import threading
+from collections import deque, namedtuple
+
+# immutable snapshot of a frame - its number and the tuple of its (surface, (x, y)[, area]) sprites,
+# the surfaces are never changed after they are drawn in a frame, so the main thread can read them at any time
+Frame = namedtuple('Frame', ('number', 'sprites'))
+
+
+class FrameBuffer(object):
+    '''
+    Double buffer of frames between one producer and one consumer.
+    The frame taken by the consumer is the front buffer, the frame waiting for it is the back buffer.
+    Putting a frame never blocks - it replaces the waiting frame, which is counted as dropped.
+    '''
+
+    # constructor
+    def __init__(self):
+        # lock of the buffer, signalled when a frame is put or the buffer is closed
+        self._condition = threading.Condition()
+        # frame waiting for the consumer
+        self._waiting = None
+        # number of frames replaced before the consumer took them
+        self._dropped = 0
+        # whether the producer finished
+        self._closed = False
+
+    def put(self, frame):
+        '''
+        Method for putting the latest frame into the buffer, replacing the waiting one.
+        '''
+        with self._condition:
+            if self._waiting is not None:
+                self._dropped += 1
+            self._waiting = frame
+            self._condition.notify()
+
+    def take(self, timeout=None):
+        '''
+        Method for taking the waiting frame, waits until there is one or for at most timeout seconds.
+        Returns None when no frame came in time or the buffer was closed and no frame is waiting.
+        '''
+        with self._condition:
+            if self._waiting is None and not self._closed:
+                self._condition.wait(timeout)
+            frame = self._waiting
+            self._waiting = None
+            return frame
+
+    def close(self):
+        '''
+        Method for closing the buffer, the consumer takes the waiting frame and then gets None.
+        '''
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def getDropped(self):
+        '''
+        Getter for the number of frames replaced before the consumer took them.
+        '''
+        with self._condition:
+            return self._dropped
+
+
+class FramePipeline(object):
+    '''
+    Class running the simulation of the frames on a worker thread.
+    Takes the function simulating one frame - it gets the list of events of the window posted since the previous
+    frame and returns the list of sprites of the frame. The main thread posts the events, takes the frames and
+    draws them. An error of the simulation is raised again in the main thread by the next take() or by stop().
+    '''
+
+    # constructor
+    def __init__(self, simulate):
+        # function simulating one frame
+        self._simulate = simulate
+        # frames handed over to the main thread
+        self._buffer = FrameBuffer()
+        # events of the window posted by the main thread, not simulated yet
+        self._events = deque()
+        # number of produced and taken frames
+        self._produced = 0
+        self._taken = 0
+        # worker thread, whether it should stop and the error which stopped it
+        self._thread = None
+        self._stopping = False
+        self._error = None
+
+    def start(self):
+        '''
+        Method for starting the worker thread.
+        '''
+        self._buffer = FrameBuffer()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='simulation', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        '''
+        Method simulating the frames until the pipeline is stopped.
+        '''
+        try:
+            while not self._stopping:
+                events = []
+                while self._events:
+                    events.append(self._events.popleft())
+                sprites = self._simulate(events)
+                self._produced += 1
+                self._buffer.put(Frame(self._produced, tuple(sprites)))
+        except Exception as error:
+            self._error = error
+        finally:
+            self._buffer.close()
+
+    def _raiseError(self):
+        '''
+        Method for raising the error which stopped the worker in the calling thread.
+        '''
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def post(self, event):
+        '''
+        Method for handing over an event of the window to the simulation, returns immediately.
+        '''
+        self._events.append(event)
+
+    def take(self, timeout=None):
+        '''
+        Method for taking the latest frame, waits for at most timeout seconds.
+        Returns None when no new frame came in time.
+        '''
+        self._raiseError()
+        frame = self._buffer.take(timeout)
+        if frame is not None:
+            self._taken += 1
+        return frame
+
+    def stop(self):
+        '''
+        Method for stopping the worker thread after its current frame.
+        '''
+        self._stopping = True
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._raiseError()
+
+    def getProduced(self):
+        '''
+        Getter for the number of simulated frames.
+        '''
+        return self._produced
+
+    def getTaken(self):
+        '''
+        Getter for the number of frames taken by the main thread.
+        '''
+        return self._taken
+
+    def getDropped(self):
+        '''
+        Getter for the number of frames replaced by newer ones before they were taken.
+        '''
+        return self._buffer.getDropped()
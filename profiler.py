@@ -0,0 +1,269 @@
+'''
+Frame profiler of the game.
+Measures the time of every phase of a frame (events, update, collision, sprites, blit, present), keeps a rolling
+history of frame times for the p50/p95/p99 percentiles and a histogram, counts entities and collision checks,
+and can write every frame into a CSV or JSON lines trace file.
+When profiling is turned off, the game uses NULL_PROFILER, whose methods do nothing.
+StartupTimer measures the stages of the startup of the game.
+'''
+
+# import libraries
+import csv, json, time
+from collections import deque
+
+# phases of a frame, collision is measured inside update
+PHASES = ('events', 'update', 'collision', 'sprites', 'blit', 'present')
+# counters of a frame
+COUNTERS = ('ticks', 'aliens', 'lasers', 'collision_checks')
+# number of frames kept in the rolling history
+HISTORY = 300
+# width of one bar of the histogram of frame times in milliseconds
+HISTOGRAM_STEP = 2.0
+# number of bars of the histogram, the last one collects all longer frames
+HISTOGRAM_BARS = 16
+
+
+def percentile(values, fraction):
+    '''
+    Function returning the value under which the given fraction of the sorted values lies.
+    '''
+    if not values:
+        return 0.0
+    index = min(int(fraction * len(values)), len(values) - 1)
+    return values[index]
+
+
+class NullProfiler(object):
+    '''
+    Profiler that measures nothing, used when profiling is turned off.
+    '''
+
+    # whether the profiler measures anything
+    enabled = False
+
+    def beginFrame(self):
+        '''
+        Method for starting a frame.
+        '''
+        pass
+
+    def endFrame(self):
+        '''
+        Method for finishing a frame.
+        '''
+        pass
+
+    def start(self, phase):
+        '''
+        Method for starting the timer of a phase.
+        '''
+        pass
+
+    def stop(self, phase):
+        '''
+        Method for stopping the timer of a phase.
+        '''
+        pass
+
+    def count(self, name, value=1):
+        '''
+        Method for adding a value to a counter of the frame.
+        '''
+        pass
+
+    def close(self):
+        '''
+        Method for closing the trace file.
+        '''
+        pass
+
+
+# the only instance of the NullProfiler
+NULL_PROFILER = NullProfiler()
+
+
+class StartupTimer(object):
+    '''
+    Timer of the stages of the startup of the game.
+    Every stage is measured from the end of the previous one, stages running in the background are measured
+    from their own start.
+    '''
+
+    # constructor
+    def __init__(self, start=None):
+        # clock used for the measurements
+        self._clock = time.perf_counter
+        # start of the startup and the end of the last stage
+        self._start = self._clock() if start is None else start
+        self._last = self._start
+        # list of (stage, duration, end) tuples in milliseconds, the end is measured from the start
+        self._stages = []
+
+    def mark(self, stage, since=None):
+        '''
+        Method for finishing a stage, measured from the end of the previous stage or from the given time.
+        '''
+
+        now = self._clock()
+        self._stages.append((stage, (now - (self._last if since is None else since)) * 1000.0,
+                             (now - self._start) * 1000.0))
+        # only the stages of the startup itself follow each other
+        if since is None:
+            self._last = now
+
+    def getStages(self):
+        '''
+        Getter for the list of (stage, duration, end) tuples in milliseconds.
+        '''
+        return list(self._stages)
+
+    def format(self):
+        '''
+        Method for getting the breakdown of the startup as text, one line per stage.
+        '''
+        return '\n'.join('startup %-20s %8.1f ms  (at %.1f ms)' % stage for stage in self._stages)
+
+
+class FrameProfiler(NullProfiler):
+    '''
+    Profiler measuring the phases and counters of every frame.
+    '''
+
+    enabled = True
+
+    # constructor
+    def __init__(self, history=HISTORY, trace=None):
+        # clock used for the measurements
+        self._clock = time.perf_counter
+        # rolling history of frame times (between two frames) and work times (inside a frame) in milliseconds
+        self._frames = deque(maxlen=history)
+        self._works = deque(maxlen=history)
+        # rolling history of the phases in milliseconds
+        self._phases = dict((phase, deque(maxlen=history)) for phase in PHASES)
+
+        # number of finished frames
+        self._frame = 0
+        # start of the current and of the previous frame
+        self._frameStart = None
+        self._previousStart = None
+        # start times of running phases, time of the phases and counters of the current frame
+        self._starts = {}
+        self._current = {}
+        self._counts = {}
+        # last finished frame
+        self._last = {}
+
+        # open the trace file
+        self._traceFile = None
+        self._writer = None
+        if trace is not None:
+            self._traceFile = open(trace, 'w', newline='')
+            # CSV file with a header, otherwise one JSON object per line
+            if trace.lower().endswith('.csv'):
+                self._writer = csv.writer(self._traceFile)
+                self._writer.writerow(('frame', 'time', 'frame_ms', 'work_ms') +
+                                      tuple(phase + '_ms' for phase in PHASES) + COUNTERS)
+
+    def beginFrame(self):
+        '''
+        Method for starting a frame.
+        '''
+        self._previousStart = self._frameStart
+        self._frameStart = self._clock()
+        self._current = {}
+        self._counts = {}
+
+    def start(self, phase):
+        '''
+        Method for starting the timer of a phase.
+        '''
+        self._starts[phase] = self._clock()
+
+    def stop(self, phase):
+        '''
+        Method for stopping the timer of a phase, a phase can run more times in one frame.
+        '''
+        self._current[phase] = self._current.get(phase, 0.0) + self._clock() - self._starts[phase]
+
+    def count(self, name, value=1):
+        '''
+        Method for adding a value to a counter of the frame.
+        '''
+        self._counts[name] = self._counts.get(name, 0) + value
+
+    def endFrame(self):
+        '''
+        Method for finishing a frame, stores it in the history and in the trace file.
+        '''
+
+        end = self._clock()
+        work = (end - self._frameStart) * 1000.0
+        # the first frame has no previous one, its frame time is its work time
+        if self._previousStart is None:
+            frame = work
+        else:
+            frame = (self._frameStart - self._previousStart) * 1000.0
+
+        self._frames.append(frame)
+        self._works.append(work)
+        phases = {}
+        for phase in PHASES:
+            phases[phase] = self._current.get(phase, 0.0) * 1000.0
+            self._phases[phase].append(phases[phase])
+
+        self._last = {'frame': self._frame, 'time': self._frameStart, 'frame_ms': frame, 'work_ms': work,
+                      'phases': phases, 'counts': dict(self._counts)}
+        self._frame += 1
+
+        # write the frame into the trace file
+        if self._writer is not None:
+            self._writer.writerow([self._last['frame'], round(self._frameStart, 6), round(frame, 4),
+                                   round(work, 4)] + [round(phases[phase], 4) for phase in PHASES] +
+                                  [self._counts.get(name, 0) for name in COUNTERS])
+        elif self._traceFile is not None:
+            self._traceFile.write(json.dumps(self._last) + '\n')
+
+    def getLastFrame(self):
+        '''
+        Getter for the dictionary describing the last finished frame.
+        '''
+        return self._last
+
+    def getFrameCount(self):
+        '''
+        Getter for the number of finished frames.
+        '''
+        return self._frame
+
+    def getPercentiles(self, work=False):
+        '''
+        Method for getting the p50, p95 and p99 of the frame times (or work times) in the history in milliseconds.
+        '''
+        values = sorted(self._works if work else self._frames)
+        return percentile(values, 0.50), percentile(values, 0.95), percentile(values, 0.99)
+
+    def getAverages(self):
+        '''
+        Method for getting the average time of every phase in the history in milliseconds.
+        '''
+        return dict((phase, sum(values) / len(values) if values else 0.0)
+                    for phase, values in self._phases.items())
+
+    def getHistogram(self, work=True, step=HISTOGRAM_STEP, bars=HISTOGRAM_BARS):
+        '''
+        Method for getting the histogram of the work times (or frame times) in the history.
+        Returns the list of numbers of frames in the bars of step milliseconds, the last bar collects all longer frames.
+        '''
+        histogram = [0] * bars
+        for value in (self._works if work else self._frames):
+            histogram[min(int(value / step), bars - 1)] += 1
+        return histogram
+
+    def close(self):
+        '''
+        Method for closing the trace file.
+        '''
+        if self._traceFile is not None:
+            self._traceFile.close()
+            self._traceFile = None
+            self._writer = None
@@ -0,0 +1,145 @@
+'''
+Renderer of the game drawing only the parts of the screen that changed.
+Instead of filling and flipping the whole screen every frame, the renderer restores the background only under
+the sprites drawn in the previous frame, draws the sprites of the current frame and pushes only these
+regions to the display with pygame.display.update(rects).
+Sprites which did not change (same surface at the same position) are not redrawn unless something changed under them.
+The render stage only draws - the sprites of a frame are collected by the scene first, and all of them (and all
+restored parts of the background) are drawn with one Surface.blits() call each instead of one blit per sprite.
+'''
+
+# import libraries
+import pygame
+# import the profiler that measures nothing
+from profiler import NULL_PROFILER
+
+# when the changed regions cover more than this part of the screen, the whole screen is updated at once
+FULL_UPDATE_RATIO = 0.5
+
+
+class DirtyRenderer(object):
+    '''
+    Class drawing frames as lists of sprites on top of a static background.
+    A sprite is a pair of a surface and the (x, y) coordinates of its top left corner, or a triple with
+    the area (x, y, width, height) of the surface as the third item, e.g. an image of a sprite atlas.
+    '''
+
+    # constructor
+    def __init__(self, screen, background):
+        # surface of the screen
+        self._screen = screen
+        # background covering the whole screen
+        self._background = background
+        # area of the screen
+        self._screenRect = screen.get_rect()
+        # sprites and their rectangles drawn in the previous frame
+        self._sprites = []
+        self._rects = []
+        # whether the whole screen has to be redrawn in the next frame
+        self._full = True
+        # profiler measuring the blit and present phases
+        self._profiler = NULL_PROFILER
+
+    def setProfiler(self, profiler):
+        '''
+        Setter for the profiler measuring the blit and present phases, NULL_PROFILER to measure nothing.
+        '''
+        self._profiler = profiler
+
+    def getScreen(self):
+        '''
+        Getter for the surface of the screen.
+        '''
+        return self._screen
+
+    def setBackground(self, background):
+        '''
+        Setter for the background, the whole screen is redrawn in the next frame.
+        '''
+        self._background = background
+        self.invalidate()
+
+    def invalidate(self):
+        '''
+        Method for redrawing the whole screen in the next frame,
+        used when something else than the renderer has drawn on the screen.
+        '''
+        self._full = True
+
+    def render(self, sprites):
+        '''
+        Method for drawing a frame.
+        Takes one parameter - sprites, the list of (surface, (x, y)) pairs or (surface, (x, y), area) triples
+        in the order of drawing.
+        Returns the list of rectangles of the screen which were updated.
+        '''
+
+        screen = self._screen
+        profiler = self._profiler
+        profiler.start('blit')
+        # draw only on whole pixels, so the same positions give the same frame, every sprite gets an area
+        sprites = [(sprite[0], (int(sprite[1][0]), int(sprite[1][1])), sprite[2] if len(sprite) > 2 else None)
+                   for sprite in sprites]
+
+        # whole screen - draw the background and all sprites and show everything
+        if self._full:
+            screen.blit(self._background, (0, 0))
+            self._rects = screen.blits(sprites)
+            self._sprites = sprites
+            self._full = False
+            profiler.stop('blit')
+            profiler.start('present')
+            pygame.display.update(self._screenRect)
+            profiler.stop('present')
+            return [self._screenRect]
+
+        # nothing changed since the previous frame
+        if sprites == self._sprites:
+            profiler.stop('blit')
+            return []
+
+        oldSprites, oldRects = self._sprites, self._rects
+        newSprites = set(sprites)
+        # sprites of the previous frame which moved, changed or disappeared
+        erased = [rect for sprite, rect in zip(oldSprites, oldRects) if sprite not in newSprites]
+        background = self._background
+
+        # most sprites changed - restore the background under all old sprites and draw all new ones
+        if 2 * len(erased) > len(oldSprites):
+            screen.blits([(background, rect, rect) for rect in oldRects], False)
+            newRects = screen.blits(sprites)
+            dirty = oldRects + newRects
+
+        # only a few sprites changed - restore the background only under them and redraw what lies on it
+        else:
+            oldSet = set(oldSprites)
+            newRects = [pygame.Rect(position, surface.get_size() if area is None else area[2:])
+                        for surface, position, area in sprites]
+            # the regions of the removed and the changed sprites, grown by the whole rectangles of the unchanged
+            # sprites overlapping them - the background is restored under every redrawn sprite, so no sprite
+            # is blended on top of itself and the sprites stay layered correctly
+            redrawn = [sprite not in oldSet for sprite in sprites]
+            dirty = erased + [rect for rect, redraw in zip(newRects, redrawn) if redraw]
+            grown = True
+            while grown:
+                grown = False
+                for index, rect in enumerate(newRects):
+                    if not redrawn[index] and rect.collidelist(dirty) != -1:
+                        redrawn[index] = True
+                        dirty.append(rect)
+                        grown = True
+            screen.blits([(background, rect, rect) for rect in dirty], False)
+            screen.blits([sprite for sprite, redraw in zip(sprites, redrawn) if redraw], False)
+
+        self._sprites = sprites
+        self._rects = newRects
+
+        # show the changed regions, or the whole screen when they cover most of it
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area > FULL_UPDATE_RATIO * self._screenRect.width * self._screenRect.height:
+            dirty = [self._screenRect]
+        profiler.stop('blit')
+        profiler.start('present')
+        pygame.display.update(dirty)
+        profiler.stop('present')
+        return dirty
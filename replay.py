@@ -0,0 +1,220 @@
+'''
+Deterministic replays of the game.
+The engine depends only on the actions passed to every tick, so a game is recorded as the list of ticks
+with their actions. The replay is stored in a compact binary file - a header with the settings of the engine,
+the number of ticks and the checksum of the final state, followed by one record per tick with any action:
+the number of ticks since the previous record (as a variable length integer) and the actions (one byte).
+Playing the replay runs the headless engine as fast as possible and checks the checksum of the final state.
+
+Usage:
+    python replay.py game-1.sirp --slowest 10
+'''
+
+# import libraries
+import struct, time
+# import the headless engine
+from engine import GameEngine, ACTION_NONE
+
+# identification of the replay files and the version of the format
+MAGIC = b'SIRP'
+VERSION = 4
+# header - magic, version, tick rate, width, height, number of ticks and the checksum of the final state
+HEADER = struct.Struct('<4sBHHHII')
+
+
+class ReplayError(Exception):
+    '''
+    Exception raised for a broken replay file or a replay that does not reproduce the recorded game.
+    '''
+    pass
+
+
+def writeVarint(buffer, value):
+    '''
+    Function appending a non-negative integer to the buffer, 7 bits per byte with the highest bit marking more bytes.
+    '''
+    while value >= 0x80:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def readVarint(data, position):
+    '''
+    Function reading a non-negative integer from the data at the given position.
+    Returns the integer and the position after it.
+    '''
+    value = 0
+    shift = 0
+    while True:
+        if position >= len(data):
+            raise ReplayError("replay ends in the middle of a record")
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+class Replay(object):
+    '''
+    Recorded game - the settings of the engine, the actions of every tick, the number of ticks
+    and the checksum of the final state.
+    '''
+
+    # constructor
+    def __init__(self, tickRate, width, height):
+        # settings of the engine
+        self.tickRate = tickRate
+        self.width = width
+        self.height = height
+        # actions of the ticks with any action, by the number of the tick
+        self.actions = {}
+        # number of recorded ticks
+        self.ticks = 0
+        # checksum of the state after the last tick
+        self.checksum = 0
+
+    def record(self, tick, actions):
+        '''
+        Method for recording the actions of a tick.
+        '''
+        if actions != ACTION_NONE:
+            self.actions[tick] = actions
+        self.ticks = max(self.ticks, tick + 1)
+
+    def finish(self, engine):
+        '''
+        Method for finishing the recording with the number of ticks and the checksum of the engine.
+        '''
+        self.ticks = engine.getTick()
+        self.checksum = engine.checksum()
+
+    def createEngine(self):
+        '''
+        Method for creating a new engine with the recorded settings.
+        '''
+        return GameEngine(self.width, self.height, self.tickRate)
+
+    def toBytes(self):
+        '''
+        Method for encoding the replay into the binary format.
+        '''
+        data = bytearray(HEADER.pack(MAGIC, VERSION, self.tickRate, self.width, self.height,
+                                     self.ticks, self.checksum))
+        previous = 0
+        for tick in sorted(self.actions):
+            writeVarint(data, tick - previous)
+            data.append(self.actions[tick])
+            previous = tick
+        return bytes(data)
+
+    @classmethod
+    def fromBytes(cls, data):
+        '''
+        Method for decoding the replay from the binary format.
+        '''
+        if len(data) < HEADER.size:
+            raise ReplayError("replay is too short")
+        magic, version, tickRate, width, height, ticks, checksum = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("not a replay file")
+        if version != VERSION:
+            raise ReplayError("unsupported version of the replay: %d" % version)
+
+        replay = cls(tickRate, width, height)
+        replay.ticks = ticks
+        replay.checksum = checksum
+        position = HEADER.size
+        tick = 0
+        while position < len(data):
+            delta, position = readVarint(data, position)
+            if position >= len(data):
+                raise ReplayError("replay ends in the middle of a record")
+            tick += delta
+            replay.actions[tick] = data[position]
+            position += 1
+        return replay
+
+    def save(self, path):
+        '''
+        Method for writing the replay into a file.
+        '''
+        with open(path, 'wb') as file:
+            file.write(self.toBytes())
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Method for reading the replay from a file.
+        '''
+        with open(path, 'rb') as file:
+            return cls.fromBytes(file.read())
+
+
+def playback(replay, engine=None, timing=False, verify=True):
+    '''
+    Function playing the replay on the headless engine as fast as possible.
+    Takes the replay, optionally the engine to use (a new one is created otherwise), whether to measure
+    the time of every tick and whether to check the checksum of the final state.
+    Returns a dictionary with the engine, the number of ticks, the duration in seconds and,
+    with timing, the list of durations of the ticks in seconds.
+    Raises ReplayError when the final state differs from the recorded one.
+    '''
+
+    if engine is None:
+        engine = replay.createEngine()
+    engine.reset()
+
+    actions = replay.actions
+    step = engine.step
+    durations = [] if timing else None
+    clock = time.perf_counter
+    start = clock()
+
+    for tick in range(replay.ticks):
+        if timing:
+            tickStart = clock()
+            step(actions.get(tick, ACTION_NONE))
+            durations.append(clock() - tickStart)
+        else:
+            step(actions.get(tick, ACTION_NONE))
+
+    seconds = clock() - start
+    if verify and engine.checksum() != replay.checksum:
+        raise ReplayError("replay does not reproduce the recorded game (checksum %08x, recorded %08x)"
+                          % (engine.checksum(), replay.checksum))
+    return {'engine': engine, 'ticks': replay.ticks, 'seconds': seconds, 'durations': durations}
+
+
+# play a replay from the command line
+if __name__ == "__main__":
+    # import libraries needed only for the command line
+    import argparse, sys
+
+    parser = argparse.ArgumentParser(description="Play a recorded game of Space Invaders without a window.")
+    parser.add_argument("replay", help="replay file recorded with space_invaders.py --record")
+    parser.add_argument("--slowest", type=int, default=0, help="show the given number of the slowest ticks")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    try:
+        result = playback(replay, timing=args.slowest > 0)
+    except ReplayError as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+
+    engine = result['engine']
+    seconds = result['seconds']
+    gameSeconds = result['ticks'] / float(replay.tickRate)
+    print("ticks: %d (%.1f s of game), score: %d, checksum %08x OK" % (result['ticks'], gameSeconds,
+                                                                      engine.getScore(), engine.checksum()))
+    print("played in %.3f s (%.0fx real time)" % (seconds, gameSeconds / seconds if seconds else 0.0))
+
+    # show the slowest ticks for finding the spikes of the frame time
+    if args.slowest:
+        durations = result['durations']
+        slowest = sorted(range(len(durations)), key=durations.__getitem__, reverse=True)[:args.slowest]
+        for tick in slowest:
+            print("tick %d: %.3f ms" % (tick, durations[tick] * 1000.0))
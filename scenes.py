@@ -0,0 +1,323 @@
+'''
+Scenes of the game - the title screen, the game itself and the end of the game.
+The game is a state machine of these scenes driven by one loop in MyGame.rungame(). A scene never calls
+another scene, it only asks MyGame to switch to it, so restarting the game does not nest any calls.
+Every scene is created only once and reused, together with the assets and the engine of MyGame.
+'''
+
+# import libraries
+import pygame
+# import the events of the engine
+from engine import EVENT_SHOT, EVENT_ALIEN_KILLED, EVENT_PLAYER_KILLED
+# import the priorities of the sound effects
+from audio import PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH
+# import the label made from the pre-rendered glyphs of digits
+from text import NumberLabel
+
+# names of the scenes
+SCENE_TITLE = 'title'
+SCENE_PLAYING = 'playing'
+SCENE_GAME_OVER = 'game_over'
+
+# maximum number of frames per second of the static scenes
+IDLE_FPS = 30
+# color of the texts
+WHITE = (255, 255, 255)
+# images of the sprites of the game, packed into one sprite atlas
+SPRITES = ("space_ship.png", "laser.png")
+# animation frames of the aliens, all aliens show the same frame at once
+ALIEN_FRAMES = ("alien.png",)
+# ticks of the simulation showing one frame of the aliens
+ALIEN_FRAME_TICKS = 30
+
+
+class Scene(object):
+    '''
+    Base class of the scenes.
+    Every frame MyGame passes the events to handleEvent(), calls update() with the elapsed time and then draws
+    the sprites returned by getSprites().
+    '''
+
+    # maximum number of frames per second of the scene, None for the limit of the game
+    maxFps = None
+
+    # constructor
+    def __init__(self, game):
+        # the game holding the screen, assets, renderer and engine
+        self._game = game
+        # name of the scene to switch to after this frame
+        self._next = None
+
+    def enter(self):
+        '''
+        Method called every time the game switches to the scene.
+        '''
+        pass
+
+    def handleEvent(self, event):
+        '''
+        Method for handling one event from the queue.
+        '''
+        pass
+
+    def update(self, elapsed):
+        '''
+        Method for updating the scene by the elapsed time in seconds.
+        '''
+        pass
+
+    def getSprites(self):
+        '''
+        Method for getting the list of (surface, (x, y)) sprites of the scene in the order of drawing.
+        '''
+        return []
+
+    def switchTo(self, name):
+        '''
+        Method for asking the game to switch to another scene after this frame.
+        '''
+        self._next = name
+
+    def takeNext(self):
+        '''
+        Method for getting (and forgetting) the name of the scene to switch to, None to stay in this scene.
+        '''
+        name = self._next
+        self._next = None
+        return name
+
+    def _centered(self, surface, dy):
+        '''
+        Method for getting the sprite of a surface centered on the screen and moved by dy pixels down.
+        '''
+        width, height = self._game.getSize()
+        return surface, surface.get_rect(center=(width/2, height/2 + dy)).topleft
+
+
+class TitleScene(Scene):
+    '''
+    Scene of the title screen, waits for space to start the game.
+    '''
+
+    maxFps = IDLE_FPS
+
+    def handleEvent(self, event):
+        '''
+        Method for handling one event, space starts the game.
+        '''
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+            self.switchTo(SCENE_PLAYING)
+
+    def getSprites(self):
+        '''
+        Method for getting the title and the instructions, the renderer draws them only once as they do not change.
+        '''
+        texts = self._game.getTexts()
+        assets = self._game.getAssets()
+        font = assets.font('ExpressionPro.otf', 30)
+        fontBigger = assets.font('ExpressionPro.otf', 50)
+
+        return [
+            self._centered(texts.render(fontBigger, 'SPACE INVADERS', WHITE), -25),
+            self._centered(texts.render(font, 'Press space to start', WHITE), 150),
+        ]
+
+
+class PlayScene(Scene):
+    '''
+    Scene of the game itself.
+    Reads the actions of the player from the controls once per tick, runs the fixed ticks of the engine for
+    the elapsed time, plays the sounds of the events and draws the models interpolated between the last two ticks.
+    The models are drawn as areas of one sprite atlas, so the renderer draws the whole frame with one call.
+    '''
+
+    # constructor
+    def __init__(self, game):
+        Scene.__init__(self, game)
+        # images and the score label, loaded when the first game starts so they do not slow down the startup
+        self._loaded = False
+
+    def _load(self):
+        '''
+        Method for loading the images and creating the score label of the scene.
+        '''
+
+        assets = self._game.getAssets()
+        # pack the images of the ship, a laser and the frames of an alien into one atlas
+        self._atlas = assets.atlas(SPRITES, {'alien': ALIEN_FRAMES})
+        # create the label showing the score, made from the pre-rendered glyphs of digits
+        self._scoreLabel = NumberLabel(assets.font('ExpressionPro.otf', 30), 'SCORE: ', WHITE,
+                                       self._game.getTexts())
+        self._loaded = True
+
+    def enter(self):
+        '''
+        Method for starting a new game.
+        The engine only resets its state, its arrays are reused.
+        '''
+
+        if not self._loaded:
+            self._load()
+
+        # start a new game in the engine, its recording and its telemetry
+        self._game.getEngine().reset()
+        self._game.startRecording()
+        self._game.startSession()
+        # forget the keys pressed before the game, such as the space starting it
+        self._game.getControls().reset()
+        # start counting the time from the beginning of this game
+        self._game.getTimestep().reset()
+
+        # stream the background music in a loop, music playing from the previous game keeps playing
+        self._game.getAudio().playMusic("space-invaders.wav", 0.02)
+
+    def handleEvent(self, event):
+        '''
+        Method for handling the user input.
+        Lets the controls remember the keys pressed since the last tick, held keys are read in every tick.
+        '''
+        self._game.getControls().handleEvent(event)
+
+    def update(self, elapsed):
+        '''
+        Method for running the fixed ticks of the simulation for the elapsed time.
+        '''
+
+        # the elapsed time is the time of the frame in the telemetry of the game
+        self._game.getSession().addFrame(elapsed)
+
+        # run the fixed ticks of the simulation for the elapsed time
+        for _ in range(self._game.getTimestep().advance(elapsed)):
+            self.tick()
+            # stop simulating when the game ended during one of the ticks
+            if self._next is not None:
+                break
+
+    def tick(self):
+        '''
+        Method for running one fixed tick of the simulation.
+        Passes the actions of the held and pressed keys to the engine, plays the sounds of its events and handles
+        the end of the game. Arrows move the ship while they are held, held space shoots whenever the engine allows.
+        '''
+
+        engine = self._game.getEngine()
+        audio = self._game.getAudio()
+        session = self._game.getSession()
+        # read the keyboard once for this tick
+        actions = self._game.getControls().poll()
+
+        # record the actions of the tick when the game is recorded
+        replay = self._game.getReplay()
+        if replay is not None:
+            replay.record(engine.getTick(), actions)
+
+        # run one tick of the engine with the actions of the player
+        events = engine.step(actions)
+
+        # count the ticks and the collision checks of the frame
+        profiler = self._game.getProfiler()
+        profiler.count('ticks')
+        profiler.count('collision_checks', engine.getWorld().getCollisionChecks())
+
+        # sound effects are loaded by the asset manager on their first use and played on the pool of channels,
+        # when all channels are busy the more important effects replace the less important ones
+        for event in events:
+            # play sound effect of shooting
+            if event == EVENT_SHOT:
+                audio.play("shoot.wav", PRIORITY_LOW)
+                session.addShot()
+            # play the sound effect of killing alien
+            elif event == EVENT_ALIEN_KILLED:
+                audio.play("invaderkilled.wav", PRIORITY_NORMAL)
+                session.addKills()
+            # play sound effect of killing player
+            elif event == EVENT_PLAYER_KILLED:
+                audio.play("explosion.wav", PRIORITY_HIGH)
+
+        # if the game ended in this tick, save its replay and telemetry and show the end of the game
+        if engine.isOver():
+            self._game.saveRecording()
+            self._game.saveSession()
+            self.switchTo(SCENE_GAME_OVER)
+
+    def getSprites(self):
+        '''
+        Method for getting the sprites of the frame in between the last two ticks.
+        '''
+
+        engine = self._game.getEngine()
+        # fraction of the next tick used for interpolating the positions between the previous and the current tick
+        alpha = self._game.getTimestep().getAlpha()
+
+        # get the text for showing the score, put together again only when the score changed
+        text = self._scoreLabel.render(engine.getScore())
+
+        # collect the sprites of the frame in the order of drawing - the text, the ship, laser projectiles and aliens
+        atlas = self._atlas
+        sheet = atlas.getSurface()
+        sprites = [(text, (10, 10)), atlas.sprite("space_ship.png", engine.getShip().getInterpolatedPos(alpha))]
+
+        # get the world storing the aliens and laser projectiles
+        world = engine.getWorld()
+
+        # profiler counting the entities drawn in the frame
+        profiler = self._game.getProfiler()
+
+        # add laser projectiles
+        xs, ys = world.getLasers().getInterpolatedPositions(alpha)
+        area = atlas.getArea("laser.png")
+        sprites.extend([(sheet, position, area) for position in zip(xs.tolist(), ys.tolist())])
+        profiler.count('lasers', len(xs))
+
+        # add aliens
+        xs, ys = world.getAliens().getInterpolatedPositions(alpha)
+        area = atlas.getArea('alien', engine.getTick() // ALIEN_FRAME_TICKS)
+        sprites.extend([(sheet, position, area) for position in zip(xs.tolist(), ys.tolist())])
+        profiler.count('aliens', len(xs))
+
+        return sprites
+
+
+class GameOverScene(Scene):
+    '''
+    Scene of the end of the game.
+    Determines whether the game ended as lost or won, shows the final score and the high score
+    and waits for space to play again.
+    '''
+
+    maxFps = IDLE_FPS
+
+    def handleEvent(self, event):
+        '''
+        Method for handling one event, space restarts the game.
+        '''
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+            self.switchTo(SCENE_PLAYING)
+
+    def getSprites(self):
+        '''
+        Method for getting the end of the game, the renderer draws it only once as it does not change.
+        '''
+
+        engine = self._game.getEngine()
+        texts = self._game.getTexts()
+        assets = self._game.getAssets()
+        font = assets.font('ExpressionPro.otf', 30)
+        fontBigger = assets.font('ExpressionPro.otf', 50)
+
+        # text for winning or losing the game
+        if engine.hasWon():
+            result = texts.render(fontBigger, 'YOU WON!', WHITE)
+        else:
+            result = texts.render(fontBigger, 'GAME OVER', WHITE)
+
+        return [
+            # result moved higher than the centre of the screen
+            self._centered(result, -25),
+            # final score and the best score of all games moved lower than the centre of the screen
+            self._centered(texts.render(font, 'SCORE: ' + str(engine.getScore()), WHITE), 25),
+            self._centered(texts.render(font, 'HIGH SCORE: ' + str(self._game.getStats().getHighScore()), WHITE),
+                           60),
+            # text for playing again at the bottom
+            self._centered(texts.render(font, 'Press space to play again', WHITE), 150),
+        ]
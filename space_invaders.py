@@ -3,568 +3,491 @@ All images, sounds, icon and font are downloaded from internet under CC0 and CC1
 '''
 
 # import libraries
-import sys, pygame, math
+import os, sys, time
+# time when the game started loading, the startup report measures the imports too
+STARTED = time.perf_counter()
+import pygame
+# import the fixed timestep of the simulation
+from timestep import FixedTimestep, TICK_RATE, MAX_FPS
+# import the headless engine running the logic of the game
+from engine import GameEngine
+# import the manager of images, sounds and fonts
+from assets import AssetManager
+# import the audio playing the sound effects and the music
+from audio import AudioManager
+# import the renderer drawing only the changed parts of the screen
+from renderer import DirtyRenderer
+# import the pipeline simulating the frames on a worker thread
+from pipeline import FramePipeline
+# import the input layer
+from controls import Controls, allowEvents, EXPOSE_EVENTS
+# import the cached text rendering
+from text import TextCache
+# import the scenes of the game
+from scenes import TitleScene, PlayScene, GameOverScene, SCENE_TITLE, SCENE_PLAYING, SCENE_GAME_OVER
+# import the frame profiler, the timer of the startup and the overlay
+from profiler import FrameProfiler, NULL_PROFILER, StartupTimer
+from overlay import ProfilerOverlay
+# import the recording of replays
+from replay import Replay
+# import the store of the high scores and the telemetry of the sessions
+from stats import StatsStore, Session, DATABASE
+# import the models, so they stay available from this module
+from models import ShipState, AlienState, LaserState
+
+# sound effects loaded in the background during the startup
+SOUNDS = ("shoot.wav", "invaderkilled.wav", "explosion.wav")
+# maximum number of seconds the pipelined main thread waits for a frame before it handles the events again
+POLL_INTERVAL = 0.005
 
 class MyGame(object):
     '''
     Class defining the game. Behaves both as a view and a controller.
+    Holds the screen, the assets and the headless GameEngine running the logic of the game, and runs
+    the state machine of the scenes (title, playing, game over) in one loop.
+    The simulation runs in fixed ticks (tickRate per second), drawing is limited to maxFps frames per second
+    and positions are interpolated between two ticks, so the speed of the game is the same on any hardware.
+    When pipelined, the scenes are updated on a worker thread (see pipeline.py) and the main thread only handles
+    the events of the window and draws and shows the frames, so a slow present does not delay the simulation.
     '''
 
     # constructor
-    def __init__(self):
+    def __init__(self, tickRate=TICK_RATE, maxFps=MAX_FPS, profile=False, trace=None, record=None,
+                 startupReport=False, pipelined=False, stats=DATABASE):
 
-        # initialize the game
-        pygame.init()
+        # timer of the stages of the startup, printed when startupReport is True
+        self._startup = StartupTimer(STARTED)
+        self._startupReport = startupReport
+        self._startup.mark('imports')
+
+        # initialize only the display (with the events) first, the fonts are initialized on their first use
+        # and the mixer in the background, so the window shows up as soon as possible
+        pygame.display.init()
 
         # window size defined as two variables
         self._size = self._width, self._height = 720, 560
-        # load background image
-        self._bg = pygame.image.load("./images/bg.png")
         # load background color
         self._black = 0, 0, 0
-        
+
+        # create the manager loading and caching the images, sounds and fonts,
+        # images loaded after creating the screen are converted to its pixel format
+        self._assets = AssetManager()
+        # load the image of the icon and set it before the window is shown,
+        # some systems cannot change the icon of a window that is already shown
+        self._icon = self._assets.image("icon.svg")
+        pygame.display.set_icon(self._icon)
+        self._startup.mark('icon')
+
         # representation of the surface/screen
         self._screen = pygame.display.set_mode(self._size)
-
         # define the caption of the screen
         pygame.display.set_caption("Space Invaders")
-        # load an image of an icon
-        self._icon = pygame.image.load("./images/icon.svg")
-        # set icon of the screen
-        pygame.display.set_icon(self._icon)
-        
-        # load fonts to the game
-        self._font = pygame.font.Font('./font/ExpressionPro.otf', 30)
-        self._font_bigger = pygame.font.Font('./font/ExpressionPro.otf', 50)
-
-        # load background music to the game
-        self._bg_music = pygame.mixer.Sound("./sounds/space-invaders.wav")
-        # set the volume of the background music
-        self._bg_music.set_volume(0.02)
-
-        # load sound effect to the game
-        # load sound effect for shooting
-        self._shoot_sound = pygame.mixer.Sound("./sounds/shoot.wav")
-        # load sound effect for when the alien gets shot
-        self._alien_killed_sound = pygame.mixer.Sound("./sounds/invaderkilled.wav")
-        # load sound effect for when the player gets killed
-        self._player_killed_sound = pygame.mixer.Sound("./sounds/explosion.wav")
-
-        # load the image of the ship
-        self._shipview = pygame.image.load("./images/space_ship.png")
-        # create a ship (model) as an object of the class ShipState()
-        self._shipmodel = ShipState(310, 460, self._width, 30)
-
-        # load the image of a laser
-        self._laserview = pygame.image.load("./images/laser.png")
-        # create a list for storing created laser projectiles
-        self._lasers = []
-
-        # load the image of an alien
-        self._alienview = pygame.image.load("./images/alien.png")
-        # create a list for storing created aliens
-        self._aliens = []
-        # set the number of aliens in a row
-        self._numAliens = 7
-
-        # store the time
-        self._time = 0
-        # store the score
-        self._score = 0
+        # let only the events the game uses into the event queue
+        allowEvents()
+        self._startup.mark('display')
+
+        # load background image, without transparency as it covers the whole screen
+        self._bg = self._assets.image("bg.png", alpha=False)
+        # compose the static background of the game once - the background color with the background image
+        self._background = pygame.Surface(self._size).convert()
+        self._background.fill(self._black)
+        self._background.blit(self._bg, (0, 0))
+        # create the renderer drawing only the changed parts of the screen over the background
+        self._renderer = DirtyRenderer(self._screen, self._background)
+        # show the background right away as the first frame
+        self._renderer.render([])
+        self._startup.mark('first frame')
+        # pipeline simulating the frames on a worker thread while the game runs, None to simulate them in the loop
+        self._pipeline = FramePipeline(self._simulate) if pipelined else None
+
+        # create the cache of rendered texts
+        self._texts = TextCache()
+
+        # create the audio playing the sound effects on a pool of channels and streaming the music,
+        # the mixer is initialized and the sound effects are loaded in the background
+        self._audio = AudioManager(self._assets)
+        audioStart = time.perf_counter()
+        self._audio.startInBackground(SOUNDS, lambda: self._startup.mark('audio (background)', audioStart))
+
+        # create the controls turning the keyboard into the actions of the player
+        self._controls = Controls()
+
+        # create the engine running the models of the game
+        self._engine = GameEngine(self._width, self._height, tickRate)
+
+        # fixed timestep of the simulation
+        self._timestep = FixedTimestep(tickRate)
+        # maximum number of drawn frames per second
+        self._maxFps = maxFps
+        # clock used for limiting the frame rate
+        self._clock = pygame.time.Clock()
+
+        # profiler of the frames, measuring nothing unless profiling is turned on
+        self._profiler = NULL_PROFILER
+        # file for the trace of the frames, the profiler stays turned on while it is recorded
+        self._trace = trace
+        # overlay showing the measurements of the profiler, toggled by F3, created when it is shown first
+        self._overlay = None
+        self._showOverlay = False
+        if profile or trace is not None:
+            self.setProfiling(True, overlay=profile)
+
+        # path of the replay files, every game is saved as <name>-<number><extension>
+        self._record = record
+        # replay of the current game, None when the games are not recorded
+        self._replay = None
+        # number of recorded games
+        self._recorded = 0
+
+        # store of the high scores and the sessions, started after the first frame, None for storing nothing
+        self._stats = StatsStore(stats)
+        # telemetry of the current game
+        self._session = None
+
+        # create every scene once, they are reused for every game
+        self._scenes = {
+            SCENE_TITLE: TitleScene(self),
+            SCENE_PLAYING: PlayScene(self),
+            SCENE_GAME_OVER: GameOverScene(self),
+        }
+        # the current scene
+        self._scene = None
+
+        # whether the first frame of the first scene was shown and the startup finished
+        self._interactive = False
 
         # store the state of the game
         self._running = True
-        # store the outcome of the game
-        self._win = False
-
-    def rungame(self):
-        '''
-        Method that behaves as a controller. It is responsible for running the game, taking the user input, 
-        validating it and manipulating models.
-        It contains infinite loop to maintain the game running.
-        '''
-
-        def create_aliens(speed):
-            '''
-            Method for creating aliens.
-            Create a row of aliens by appending created object of class Alien according to given values.
-            It takes one parameter - speed, which determines the x and y value of created aliens as well
-            as their speed (change of x coordinates of alien)
-            '''
-
-            # size of an alien in pixels
-            alien_size = 40
-            # space between two aliens in pixels
-            space_between = 30
-
-            # for loop to create required number of aliens
-            for i in range(self._numAliens):
-                # if the row is moving to the right = if the change of x coordinates is a positive number
-                if speed > 0:
-                    # create object of class Alien with required values
-                    # and add it at the end of the list storing all created aliens
-                    self._aliens.append(AlienState(1 + (space_between + alien_size)*i, 50, self._width, self._height-\
-                        80, speed, space_between))
-                # if the row is moving to the left = if the change of x coordinates is a negative number
-                else:
-                    # create object of class Alien with required values
-                    # and add it at the end of the list storing all created aliens
-                    self._aliens.append(AlienState(self._width - (self._numAliens*(space_between + alien_size)) + space_between +\
-                        (space_between + alien_size)*i, 50, self._width, self._height-80, speed, space_between))
-
-        # call the method to create a row of aliens with the speed of 0.05
-        create_aliens(0.4)
-
-        # infinite while loop for running the game when self._running is set to True
-        while self._running:
-            # play background music in a loop
-            self._bg_music.play(-1)
-
-            # get the events
-            for event in pygame.event.get():
-                # if the type of event is QUIT
-                if event.type == pygame.QUIT:
-                    # raise SystemExit exception and exit Python
-                    sys.exit()
-
-                # if the type of event is pressed key
-                if event.type == pygame.KEYDOWN:
-                    # if the pressed key is left arrow
-                    if event.key == pygame.K_LEFT:
-                        # call the moveLeft method from our object of a ShipState class
-                        # moves the ship to the left in the game
-                        self._shipmodel.moveLeft()
-
-                    # if the key is right arrow
-                    if event.key == pygame.K_RIGHT:
-                        # call the moveRight method from our object of a ShipState class
-                        # moves the ship to the right in the game
-                        self._shipmodel.moveRight()
-
-                    # if the pressed key is space 
-                    if event.key == pygame.K_SPACE:
-                        # get the current time 
-                        currentTime = pygame.time.get_ticks()
-
-                        # wait 1 second between shooting projectiles
-                        # if the current time - time from attribute _time is more than 1 second
-                        if currentTime - self._time > 1000:
-                            # set the attribute _time to current time to store the time at which 
-                            # was the last laser projectile shot
-                            self._time = currentTime
-                            # create an object of a class Laser and add it to the end of the list storing all shot laser projectiles
-                            # set the coordinates according to the ship model and move as needed to center
-                            self._lasers.append(LaserState(self._shipmodel.getXPos() + 30, self._shipmodel.getYPos() - 40, 20)) 
-                            # play sound effect of shooting on Channel 1 to play multiple sounds at the same time
-                            pygame.mixer.Channel(1).play(self._shoot_sound)                     
-                
-                # if type of event is 'unpressing' the key
-                if event.type == pygame.KEYUP:
-                    # call the stopMove method from our object of a ShipState class
-                    self._shipmodel.stopMove()
-            
-            # check the length of list storing all created aliens to determine the win
-            # if the list storing all created aliens is empty
-            if len(self._aliens) == 0:
-                # set the attribute _win to True to signalize winning
-                self._win = True
-                # stop running the game
-                self._running = False
-                # call the endgame method
-                self.endgame()
-        
-            # draw the screen after handling events
-            # set the basic background with the color specified in _black attribute
-            self._screen.fill(self._black) 
-            # draw the background image
-            self._screen.blit(self._bg, (0, 0))
-            # draw the ship
-            self._screen.blit(self._shipview, (self._shipmodel.getXPos(), self._shipmodel.getYPos()))
-
-            # create text for showing the score
-            # True for smooth character edges, rgb code for color and None for transparent background
-            self._text = self._font.render('SCORE: ' + str(self._score), True, (255,255,255), None)
-            # draw the text
-            self._screen.blit(self._text, (10, 10))
-            
-            # for loop to iterate through the list storing all created laser projectiles
-            for laser in self._lasers:
-                # call the shoot method from our object's laser's class Laser
-                laser.shoot()
-                # check if the laser projectile is withing set screen boundaries
-                if laser.inScreen() == True:
-                    # draw laser projectile
-                    self._screen.blit(self._laserview, (laser.getXPos(), laser.getYPos()))
-                # if laser projectile out of set screen boundaries
-                else:
-                    # remove such laser from the list storing all created laser projectiles
-                    self._lasers.remove(laser)
-
-            # for loop to iterate through the list storing all created aliens
-            for alien in self._aliens:
-                # check if alien is within the set screen boundaries
-                if alien.withinBordersX() == True:
-                    # call the move method from alien's class Alien
-                    alien.move()
-                    # draw alien
-                    self._screen.blit(self._alienview, (alien.getXPos(), alien.getYPos()))
-
-                    # handling collisions
-                    # for loop to iterate through the list storing all created laser projectiles
-                    for laser in self._lasers:
-                        # call the isCollidingWith method from alien's class Alien to check collision with laser projectile
-                        if alien.isCollidingWith(laser):
-                            # play the sound effect of killing alien on Channel 0 to play multiple sounds at the same time
-                            pygame.mixer.Channel(0).play(self._alien_killed_sound)
-                            # remove such laser from the list storing all created laser projectiles
-                            self._lasers.remove(laser)
-                            # remove hit alien from the list storing all created aliens
-                            self._aliens.remove(alien)
-                            # increment score by 5
-                            self._score += 5
-
-                    # call the isCollidingWith method from alien's class Alien to check collision with ship
-                    if alien.isCollidingWith(self._shipmodel):
-                        # play sound effect of killing player on Channel 0 to play multiple sounds at the same time
-                        pygame.mixer.Channel(0).play(self._player_killed_sound)
-                        # wait 100 milliseconds
-                        pygame.time.wait(100)
-                        # set the state of game running to False
-                        self._running = False
-                        # call endgame method
-                        self.endgame()
-
-                    # check if alien reached the set border of the screen
-                    if alien.outOfBorderY() == True:
-                        # remove such alien from list storing all created aliens
-                        self._aliens.remove(alien)
-
-                # if alien reaches the edge of the screen
-                else:
-                    # change the y coordinates of aliens to move down
-                    # iterate through the list storing all created aliens
-                    for alien in self._aliens:
-                        # call moveDown method from alien's class Alien to change the y coordinates of alien
-                        alien.moveDown()
-                        # call move method from alien's class Alien to move the alien on the screen
-                        alien.move()
-                    # create a new row of aliens
-                    # call create_aliens method with speed according to already created alien's speed
-                    create_aliens(alien.getChange())
-
-            # switch between buffers
-            pygame.display.flip()
-
-    def endgame(self):
-        '''
-        Method for the end state of the game.
-        Determines whether the game ended as lost or won and behaves accordingly.
-        Behaves also as a controller.
-        '''
-
-        # set the background color to color stored in _black attribute
-        self._screen.fill(self._black) 
-        # draw the background image
-        self._screen.blit(self._bg, (0, 0))
-
-        # check the state of the game
-        # if _win is set to True
-        if self._win == True:
-            # create text for winning the game
-            # True for smooth character edges, rgb code for color and None for transparent background
-            self._wonText = self._font_bigger.render('YOU WON!', True, (255,255,255), None)
-            # draw the _wonText
-            # extract area that represents the text and set its center to the centre of the screen
-            # edit the y coordinate to move it higher
-            self._screen.blit(self._wonText, (self._wonText.get_rect(center=(self._width/2, self._height/2 - 25))))
-        # if _win is set to False
-        else:
-            # create text for losing the game
-            # True for smooth character edges, rgb code for color and None for transparent background
-            self._gameOverText = self._font_bigger.render('GAME OVER', True, (255,255,255), None)
-            # draw the _gameOverText
-            # extract area that represents the text and set its center to the centre of the screen
-            self._screen.blit(self._gameOverText, (self._gameOverText.get_rect(center=(self._width/2, self._height/2 - 25))))
-
-        # create text for showing the final score
-        # True for smooth character edges, rgb code for color and None for transparent background
-        self._scoreFinal = self._font.render('SCORE: ' + str(self._score), True, (255,255,255), None)
-        # draw the _scoreFinal
-        # extract area that represents the text and set its center to the centre of the screen
-        # edit the y coordinate to move it lower on the screen
-        self._screen.blit(self._scoreFinal, (self._scoreFinal.get_rect(center=(self._width/2, self._height/2 + 25))))
-
-        # create text for playing again
-        # True for smooth character edges, rgb code for color and None for transparent background
-        self._playAgainText = self._font.render('Press space to play again', True, (255,255,255), None)
-        # draw the _playAgainText
-        # extract area that represents the text and set its center to the centre of the screen
-        # edit the y coordinate to move it lower on the screen
-        self._screen.blit(self._playAgainText, (self._playAgainText.get_rect(center=(self._width/2, self._height/2 + 150))))
-
-        # switch between buffers
-        pygame.display.flip()
-
-        # infinite while loop
-        while True:
-            # get the events
-            for event in pygame.event.get():
-                # if the type of event is QUIT
-                if event.type == pygame.QUIT:
-                    # raise SystemExit exception and exit Python
-                    sys.exit()
-
-                # if the type of event is pressed key
-                if event.type == pygame.KEYDOWN:
-                    # if the pressed key is space
-                    if event.key == pygame.K_SPACE:
-                        # restart the game
-                        # reset the _score value by setting it to 0
-                        self._score = 0
-                        # reset the _aliens list by making a new empty list
-                        self._aliens = []
-                        # reset the _lasers list by making a new empty list
-                        self._lasers = []
-                        # set the state of game in _running to True
-                        self._running = True
-                        # call the rungame method to run the game 
-                        self.rungame()
-            
-
-class ShipState(object):
-    '''
-    Model for Ship.
-    State of ship that is being moved based on user interactions.
-    Maintains the information that describes the position of the ship, its maximal x coordinate
-    and its change of coordinates (speed).
-    Contains methods for getting x and y coordinates and handling the movement.
-    '''
+        self._startup.mark('game')
 
-    # constructor
-    def __init__(self, xpos, ypos, maxxpos, change):
-        # set the instance attributes
-        # x coordinate 
-        self._x = xpos
-        # y coordinate
-        self._y = ypos
-        # maximum allowed value for x coordinate
-        self._maxX = maxxpos
-        # change of the coordinates (speed)
-        self._shipChange = change
-
-        # width
-        self._width = 75
-
-    def getXPos(self):
+    def getSize(self):
         '''
-        Getter for x coordinate returning the value of x coordinate of an object.
+        Getter for the (width, height) size of the screen.
         '''
-        return self._x
+        return self._size
 
-    def getYPos(self):
+    def getScreen(self):
         '''
-        Getter for y coordinate returning the value of y coordinate of an object.
+        Getter for the surface of the screen.
         '''
-        return self._y
+        return self._screen
 
-    
-    def moveLeft(self):
+    def getAssets(self):
         '''
-        Method for moving object to the left by decrementing its x coordinate.
-        Triggered by left arrow in controller.
+        Getter for the manager of images, sounds and fonts.
         '''
+        return self._assets
 
-        # if the x coordinate - change of coordinates is more than 0 (= is within the screen borders)
-        if self._x - self._shipChange > 0:
-            # decrement the x coordinate by change of coordinates (speed)
-            self._x -= self._shipChange
-
-    def moveRight(self):
+    def getTexts(self):
         '''
-        Method for moving object to the right by incrementing its x coordinate.
-        Triggered by right arrow in controller.
+        Getter for the cache of rendered texts.
         '''
-        
-        # if the x coordinate + width + change of coordinates is less than maximum allowed value of x coordinate
-        if self._x + self._width + self._shipChange < self._maxX:
-            # increment the x coordinate by change of coordinates (speed)
-            self._x += self._shipChange
+        return self._texts
 
-    def stopMove(self):
+    def getRenderer(self):
         '''
-        Method for stopping the movement of an object.
-        Triggered by 'unpressing' the key in controller.
+        Getter for the renderer drawing the frames.
         '''
+        return self._renderer
 
-        # set the x coordinate to itself
-        self._x = self._x
-
-class AlienState(object):
-    '''
-    Model for Alien.
-    State of alien that is being moved on the screen.
-    Maintains the information that describes the position of the alien, its maximal x and y coordinates,
-    its change of coordinates (speed) and the space between two aliens.
-    Contains methods for getting x and y coordinates, handling movement, checking whether the coordinates
-    are within set boundaries and handling collision
-    '''
-
-    # constructor
-    def __init__(self, xpos, ypos, maxxpos, maxypos, xchange, space):
-        # set instance attributes
-        # x coordinate
-        self._x = xpos
-        # y coordinate
-        self._y = ypos
-        # maximum allowed value for x coordinate
-        self._maxX = maxxpos
-        # maximum allowed value for y coordinate
-        self._maxY = maxypos
-        # change of coordinates (speed)
-        self._alienChange = xchange
-        # space between two aliens
-        self._spaceBetween = space
-
-        # size 
-        self._size = 40
+    def getAudio(self):
+        '''
+        Getter for the audio playing the sound effects and the music.
+        '''
+        return self._audio
 
-    def getXPos(self):
+    def getControls(self):
         '''
-        Getter for x coordinate returning the value of x coordinate of an object.
+        Getter for the controls of the player.
         '''
-        return self._x
+        return self._controls
 
-    def getYPos(self):
+    def getEngine(self):
         '''
-        Getter for y coordinate returning the value of y coordinate of an object.
+        Getter for the headless engine running the logic of the game.
         '''
-        return self._y
+        return self._engine
 
-    def getChange(self):
+    def getTimestep(self):
         '''
-        Getter for the change of coordinates returning the value of the change of coordinates of an object.
+        Getter for the fixed timestep of the simulation.
         '''
-        return self._alienChange
+        return self._timestep
 
-    def withinBordersX(self):
+    def getProfiler(self):
         '''
-        Method for checking whether the x coordinate is within set boundaries.
-        X coordinate cannot be 'out of the screen', therefore lower than 0 and higher than screen's width.
+        Getter for the profiler of the frames, NULL_PROFILER when profiling is turned off.
         '''
-        
-        # check if x coordinate + size + change of coordinates is lower than the maximum allowed x value
-        # and if the x coordinate is higher than 0
-        if self._x + self._size + self._alienChange < self._maxX and +\
-            self._x > 0:
-            # return True
-            return True 
+        return self._profiler
 
-    def outOfBorderY(self):
+    def setProfiling(self, enabled, overlay=True):
         '''
-        Method for checking whether the y coordinates are within the set boundaries.
-        Alien cannot go below the ship, so the y coordinates cannot be lower than the ship's.
+        Method for turning the profiling on or off.
+        Takes two parameters - enabled, whether to profile, and overlay, whether to show the overlay when profiling.
         '''
 
-        # check if y coordinate is higher than the maximum allowed value for y coordinate
-        if self._y > self._maxY:
-            # return True
-            return True
+        # turn the profiling on, the trace file is opened only once
+        if enabled and not self._profiler.enabled:
+            self._profiler = FrameProfiler(trace=self._trace)
+        # turn the profiling off, finish the trace
+        elif not enabled and self._profiler.enabled:
+            self._profiler.close()
+            self._profiler = NULL_PROFILER
 
-    def move(self):
+        self._showOverlay = enabled and overlay
+        if self._showOverlay and self._overlay is None:
+            self._overlay = ProfilerOverlay(self._assets.font('ExpressionPro.otf', 20), self._width)
+        # measure also the collisions in the engine and the blits and present in the renderer,
+        # the profiler is not shared between the worker of the pipeline and the main thread drawing the frames
+        self._engine.setProfiler(self._profiler)
+        self._renderer.setProfiler(self._profiler if self._pipeline is None else NULL_PROFILER)
+
+    def toggleOverlay(self):
         '''
-        Method for defining the movement of an alien.
+        Method for showing or hiding the profiler overlay.
+        Profiling is turned on with the overlay and off without it, unless the trace is recorded.
         '''
-        
-        # increment the x coordinate by the change of coordinates (speed)
-        self._x += self._alienChange
-    
-    def moveDown(self):
+        if self._showOverlay:
+            self.setProfiling(self._trace is not None, overlay=False)
+        else:
+            self.setProfiling(True)
+
+    def getReplay(self):
         '''
-        Method for defining the movement downward of an alien.
-        Happens when the alien reaches the edge of the screen and has to be moved a row lower.
+        Getter for the replay of the current game, None when the games are not recorded.
         '''
+        return self._replay
 
-        # increment the y coordinate by the size of an alien and the space between two aliens
-        self._y += self._size + self._spaceBetween
-        # change the direction of alien movement
-        # set the change of coordinates to its opposite value
-        self._alienChange = -self._alienChange
+    def startRecording(self):
+        '''
+        Method for starting the replay of a new game, if the games are recorded.
+        '''
+        if self._record is not None:
+            self._replay = Replay(self._engine.getTickRate(), self._width, self._height)
 
-    def isCollidingWith(self, object):
+    def saveRecording(self):
         '''
-        Method for checking the collisions between alien and other object passed in.
+        Method for finishing the replay of the current game and saving it into the next numbered file.
         '''
+        if self._replay is None:
+            return
+        self._replay.finish(self._engine)
+        self._recorded += 1
+        name, extension = os.path.splitext(self._record)
+        self._replay.save("%s-%d%s" % (name, self._recorded, extension or '.sirp'))
+        self._replay = None
 
-        # calculate the distance between alien and object using mathematical formula
-        distance = math.sqrt((math.pow(self._x + self._alienChange -  object.getXPos(), 2)) +
-                         (math.pow(self._y -  object.getYPos(), 2)))
+    def getPipeline(self):
+        '''
+        Getter for the pipeline simulating the frames on a worker thread, None when the game is not pipelined.
+        '''
+        return self._pipeline
 
-        # if the distance is smaller than the size of an alien
-        if distance < self._size:
-            # return True = collision happened
-            return True
-        # if the distance is higher than the size of an alien
-        else:
-            # return False # collision not happening
-            return False
+    def getStats(self):
+        '''
+        Getter for the store of the high scores and the telemetry of the sessions.
+        '''
+        return self._stats
 
-    
-class LaserState(object):    # model
-    '''
-    Model for Laser.
-    State of laser that is being moved ('shot') on the screen.
-    Maintains the information that describes the position of the laser projectile and its change of coordinates (speed).
-    Contains methods for getting x and y coordinates, handling movement (shooting), and checking whether the y coordinate
-    is within set boundaries.
-    The laser projectile shouldn't get 'out of the screen', so its y coordinate can't go under 0.
-    '''
+    def getSession(self):
+        '''
+        Getter for the telemetry of the current game, None when no game is played.
+        '''
+        return self._session
 
-    # constructor
-    def __init__(self, xpos, ypos, change):
-        # set instance attributes
-        # x coordinate
-        self._x = xpos
-        # y coordinate
-        self._y = ypos
-        # change of coordinates (speed)
-        self._laserChange = change
+    def startSession(self):
+        '''
+        Method for starting the telemetry of a new game.
+        '''
+        self._session = Session()
 
-    def getXPos(self):
+    def saveSession(self):
         '''
-        Getter for x coordinate returning the value of x coordinate of an object.
+        Method for finishing the telemetry of the current game and handing it over to the store,
+        which writes it in the background.
         '''
-        return self._x
+        if self._session is None:
+            return
+        self._session.finish(self._engine)
+        self._stats.record(self._session)
+        self._session = None
 
-    def getYPos(self):
+    def getStartup(self):
         '''
-        Getter for y coordinate returning the value of y coordinate of an object.
+        Getter for the timer of the stages of the startup.
         '''
-        return self._y    
+        return self._startup
 
-    def inScreen(self):
+    def _finishStartup(self):
         '''
-        Method for checking whether the y coordinates are within the set boundaries.
-        Laser projectile cannot get higher than the upper edge of the screen (0).
+        Method called after the first frame of the first scene, starts the secondary services
+        and reports the breakdown of the startup.
         '''
 
-        # check if y coordinate is higher than 0
-        if self._y > 0:
-            # return True
-            return True   
+        self._startup.mark('interactive')
+        self._interactive = True
+        # open the database of the sessions in the background
+        self._stats.start()
+        if self._startupReport:
+            print(self._startup.format(), file=sys.stderr)
+
+    def changeScene(self, name):
+        '''
+        Method for switching to the scene with the given name.
+        '''
+        self._scene = self._scenes[name]
+        self._scene.enter()
 
-    def shoot(self):
+    def _pollEvents(self):
         '''
-        Method for 'shooting' the laser projectile. 
-        Happens by decrementing the y coordinate to move upwards on the screen.
-        Triggered by space in controller.
+        Method getting the events of the window, called only by the main thread.
+        Handles the events of the window itself and returns the other events for the simulation.
         '''
 
-        # decrement the y coordinate by the change of coordinates (speed)
-        self._y -= self._laserChange 
+        events = []
+        for event in pygame.event.get():
+            # if the type of event is QUIT, stop running the game
+            if event.type == pygame.QUIT:
+                self._running = False
+            # the window was covered or minimized, draw the whole screen again
+            elif event.type in EXPOSE_EVENTS:
+                self._renderer.invalidate()
+            else:
+                events.append(event)
+        return events
+
+    def _simulate(self, events=None, render=None):
+        '''
+        Method simulating one frame - handles the events, updates the current scene by the elapsed time, switches
+        the scene if the scene asked for it and returns the sprites of the frame.
+        Takes two parameters - events, the events handed over by the main thread (None for getting them here),
+        and render, the function drawing the sprites before the end of the frame is measured.
+        '''
+
+        # wait so that the frame rate does not exceed the limit of the scene, get the elapsed time in seconds
+        elapsed = self._clock.tick(self._scene.maxFps or self._maxFps) / 1000.0
+        profiler = self._profiler
+        profiler.beginFrame()
+
+        # handle the events
+        profiler.start('events')
+        if events is None:
+            events = self._pollEvents()
+        for event in events:
+            # F3 shows or hides the profiler overlay
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.toggleOverlay()
+            # pass other events to the current scene
+            else:
+                self._scene.handleEvent(event)
+        profiler.stop('events')
+
+        # update the current scene
+        profiler.start('update')
+        self._scene.update(elapsed)
+        profiler.stop('update')
+
+        # switch the scene if the current scene asked for it
+        name = self._scene.takeNext()
+        if name is not None:
+            self.changeScene(name)
+
+        # get the sprites of the frame, with the overlay on top
+        profiler.start('sprites')
+        sprites = self._scene.getSprites()
+        if self._showOverlay:
+            sprites.append(self._overlay.getSprite(profiler))
+        profiler.stop('sprites')
+
+        if render is not None:
+            render(sprites)
+        profiler.endFrame()
+        return sprites
+
+    def rungame(self, scene=SCENE_TITLE):
+        '''
+        Method that behaves as a controller. It is responsible for running the game, taking the user input
+        and passing it to the current scene.
+        It contains the only loop of the game, which runs until the window is closed. Every frame the loop
+        handles the events, updates the current scene by the elapsed time, switches the scene if the scene asked
+        for it and draws the frame. Switching the scene never nests the loop, so the game can be played again
+        any number of times.
+        When pipelined, the worker of the pipeline simulates the frames and the loop only hands over the events
+        and the state of the keyboard to it and draws the latest frame - SDL allows the events and the drawing
+        on the screen only on the main thread.
+        '''
+
+        # start in the given scene
+        self.changeScene(scene)
+        self._running = True
+        self._clock.tick()
+        # from now on only the worker of the pipeline touches the scenes
+        if self._pipeline is not None:
+            self._pipeline.start()
+
+        # while loop for running the game until the window is closed, the game is shut down also when the loop
+        # or the worker of the pipeline stops on an error
+        try:
+            while self._running:
+                if self._pipeline is None:
+                    self._simulate(render=self._renderer.render)
+                else:
+                    # hand over the events and the state of the keyboard, then draw the latest frame if there is one
+                    for event in self._pollEvents():
+                        self._pipeline.post(event)
+                    self._controls.setKeys(pygame.key.get_pressed())
+                    frame = self._pipeline.take(POLL_INTERVAL)
+                    if frame is None:
+                        continue
+                    self._renderer.render(frame.sprites)
+
+                # the first scene is on the screen, finish the startup
+                if not self._interactive:
+                    self._finishStartup()
+        finally:
+            self._shutdown()
+
+    def _shutdown(self):
+        '''
+        Method stopping the pipeline and showing its last frame, saving the replay and the session of an unfinished
+        game, finishing the trace and closing the window. Every step runs even when stopping the pipeline fails.
+        '''
+
+        try:
+            if self._pipeline is not None:
+                self._pipeline.stop()
+                frame = self._pipeline.take(0)
+                if frame is not None:
+                    self._renderer.render(frame.sprites)
+        finally:
+            self.saveRecording()
+            self.saveSession()
+            self._stats.close()
+            self._profiler.close()
+            # the mixer may still be starting in the background when the game is closed right away
+            self._audio.join()
+            pygame.quit()
+
 
 # execute the game
 if __name__ == "__main__":
+    # import libraries needed only for the command line
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Space Invaders")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="ticks of the simulation per second")
+    parser.add_argument("--max-fps", type=int, default=MAX_FPS, help="maximum drawn frames per second, 0 for no limit")
+    parser.add_argument("--profile", action="store_true", help="start with the profiler overlay (toggled by F3)")
+    parser.add_argument("--trace", help="write every frame into a trace file (.csv or JSON lines)")
+    parser.add_argument("--record", help="record every game into a replay file (numbered NAME-1.sirp, NAME-2.sirp...)")
+    parser.add_argument("--startup-report", action="store_true", help="print the time of the stages of the startup")
+    parser.add_argument("--pipelined", action="store_true", help="simulate the frames on a worker thread")
+    parser.add_argument("--stats", default=DATABASE, help="SQLite database of the high scores and sessions")
+    parser.add_argument("--no-stats", action="store_true", help="do not store the high scores and sessions")
+    args = parser.parse_args()
+
     # initialize game
-    mygame = MyGame()
+    mygame = MyGame(args.tick_rate, args.max_fps, args.profile, args.trace, args.record, args.startup_report,
+                    args.pipelined, None if args.no_stats else args.stats)
     # run game
-    mygame.rungame()
\ No newline at end of file
+    mygame.rungame()
@@ -0,0 +1,326 @@
+'''
+High scores and telemetry of the played games.
+Every game (session) is stored in a local SQLite database with its score, duration, aliens killed, shots, wave,
+outcome and the average and p99 frame time. The loop of the game only puts the finished sessions into a queue,
+a background thread computes their frame statistics and writes them in batches, one transaction per batch,
+so writing never stalls a frame. The best score is kept in memory for showing it in the game.
+
+Usage:
+    python stats.py                        # summary, sessions per day and the 10 best scores
+    python stats.py --days 7 --top 20      # only the sessions of the last 7 days
+    python stats.py --database other.sqlite3 --by outcome
+'''
+
+# import libraries
+import os, queue, sqlite3, sys, threading, time
+from array import array
+# import the percentiles of the frame times
+from profiler import percentile
+
+# default database of the game, in the directory of the game
+DATABASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stats.sqlite3')
+# maximum number of sessions written in one transaction
+BATCH = 32
+# number of seconds the writer waits for more sessions before it writes a batch
+FLUSH_INTERVAL = 2.0
+
+# outcomes of a session
+OUTCOME_WON = 'won'
+OUTCOME_LOST = 'lost'
+OUTCOME_QUIT = 'quit'
+
+# columns of the sessions, in the order of the rows
+COLUMNS = ('started', 'duration', 'score', 'kills', 'shots', 'wave', 'ticks', 'outcome', 'frames',
+           'frame_avg', 'frame_p99')
+# tables of the database, created when they do not exist
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    score INTEGER NOT NULL,
+    kills INTEGER NOT NULL,
+    shots INTEGER NOT NULL,
+    wave INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    frames INTEGER NOT NULL,
+    frame_avg REAL,
+    frame_p99 REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_score ON sessions (score DESC);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started);
+'''
+# groupings of the report, by the SQL expression of the group
+GROUPS = {
+    'day': "date(started, 'unixepoch', 'localtime')",
+    'outcome': 'outcome',
+    'wave': 'wave + 1',
+}
+
+
+class Session(object):
+    '''
+    Telemetry of one game, collected by the loop of the game.
+    After finish() the session is not changed anymore and is handed over to the writer.
+    '''
+
+    # constructor
+    def __init__(self):
+        # wall clock time of the start, stored in the database, and the clock measuring the duration
+        self._started = time.time()
+        self._clock = time.perf_counter()
+        # times of the frames in milliseconds
+        self._frames = array('d')
+        # number of killed aliens and shots
+        self._kills = 0
+        self._shots = 0
+        # results of the finished game
+        self._duration = 0.0
+        self._score = 0
+        self._wave = 0
+        self._ticks = 0
+        self._outcome = None
+
+    def addFrame(self, elapsed):
+        '''
+        Method for adding the time of a frame in seconds.
+        '''
+        self._frames.append(elapsed * 1000.0)
+
+    def addKills(self, kills=1):
+        '''
+        Method for counting killed aliens.
+        '''
+        self._kills += kills
+
+    def addShot(self):
+        '''
+        Method for counting a shot.
+        '''
+        self._shots += 1
+
+    def finish(self, engine, outcome=None):
+        '''
+        Method for finishing the session with the results of the engine.
+        Without an outcome, it is determined by the engine - won, lost or quit when the game is not over.
+        '''
+
+        self._duration = time.perf_counter() - self._clock
+        self._score = engine.getScore()
+        self._wave = engine.getFormation().getWave()
+        self._ticks = engine.getTick()
+        if outcome is None:
+            outcome = OUTCOME_WON if engine.hasWon() else OUTCOME_LOST if engine.isOver() else OUTCOME_QUIT
+        self._outcome = outcome
+
+    def getScore(self):
+        '''
+        Getter for the score of the finished session.
+        '''
+        return self._score
+
+    def getRow(self):
+        '''
+        Method for getting the row of the session with the values of COLUMNS.
+        Sorts the frame times for the p99, so it is called by the writer, not by the loop of the game.
+        '''
+
+        frames = sorted(self._frames)
+        average = sum(frames) / len(frames) if frames else None
+        p99 = percentile(frames, 0.99) if frames else None
+        return (self._started, round(self._duration, 3), self._score, self._kills, self._shots, self._wave,
+                self._ticks, self._outcome, len(frames), average, p99)
+
+
+class StatsStore(object):
+    '''
+    Class storing the sessions in the SQLite database on a background thread.
+    A database which cannot be opened or written does not stop the game - it is reported once and the sessions
+    are then only kept for the best score. Without a path nothing is stored.
+    '''
+
+    # constructor
+    def __init__(self, path=DATABASE, batch=BATCH, interval=FLUSH_INTERVAL):
+        # path of the database, None for storing nothing
+        self._path = path
+        # maximum number of sessions of one transaction and the seconds of waiting for more sessions
+        self._batch = batch
+        self._interval = interval
+        # finished sessions waiting for the writer, None stops the writer
+        self._queue = queue.Queue()
+        # best score of the stored and the recorded sessions
+        self._best = 0
+        # number of sessions written to the database
+        self._written = 0
+        # thread writing the sessions and whether it stopped on an error of the database
+        self._thread = None
+        self._failed = False
+
+    def start(self):
+        '''
+        Method for starting the writer, which opens the database and loads the best score in the background.
+        '''
+        if self._path is not None and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='stats', daemon=True)
+            self._thread.start()
+
+    def getHighScore(self):
+        '''
+        Getter for the best score, of the database (once it is loaded) and of the recorded sessions.
+        '''
+        return self._best
+
+    def hasFailed(self):
+        '''
+        Getter for whether the database could not be opened or written, the sessions are then not stored anymore.
+        '''
+        return self._failed
+
+    def getWritten(self):
+        '''
+        Getter for the number of sessions written to the database.
+        '''
+        return self._written
+
+    def record(self, session):
+        '''
+        Method for storing a finished session, returns immediately.
+        '''
+        self._best = max(self._best, session.getScore())
+        if self._thread is not None and not self._failed:
+            self._queue.put(session)
+
+    def close(self):
+        '''
+        Method for writing the waiting sessions and stopping the writer.
+        '''
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        '''
+        Method of the writer, writes the sessions in batches until it gets None.
+        '''
+
+        try:
+            connection = connect(self._path)
+            best = connection.execute('SELECT MAX(score) FROM sessions').fetchone()[0]
+        except sqlite3.Error as error:
+            print("Cannot open %s: %s" % (self._path, error), file=sys.stderr)
+            self._fail()
+            return
+        self._best = max(self._best, best or 0)
+
+        running = True
+        while running:
+            # wait for a session, then collect more for a while, so they are written at once
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._interval
+            while batch[-1] is not None and len(batch) < self._batch:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                running = False
+
+            if batch:
+                try:
+                    with connection:
+                        connection.executemany('INSERT INTO sessions (%s) VALUES (%s)' % (
+                            ', '.join(COLUMNS), ', '.join('?' * len(COLUMNS))), [session.getRow() for session in batch])
+                    self._written += len(batch)
+                except sqlite3.Error as error:
+                    print("Cannot write %s: %s" % (self._path, error), file=sys.stderr)
+                    self._fail()
+                    running = False
+        connection.close()
+
+    def _fail(self):
+        '''
+        Method of the writer stopping on an error, record() stops queuing and the queued sessions are dropped.
+        '''
+        self._failed = True
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+
+def connect(path=DATABASE):
+    '''
+    Function opening the database and creating its tables when they do not exist.
+    '''
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def report(connection, by='day', days=None, top=10):
+    '''
+    Function querying the aggregate report of the sessions.
+    Returns the summary of all sessions, the list of summaries by the given grouping and the list of the best
+    sessions, every summary is a (group, sessions, hours, average score, best score, kills, win rate,
+    average frame time, p99 frame time) tuple, the frame times are averages of the sessions.
+    '''
+
+    where = ''
+    parameters = ()
+    if days is not None:
+        where = 'WHERE started >= ?'
+        parameters = (time.time() - days * 86400.0,)
+    aggregates = ('COUNT(*), SUM(duration) / 3600.0, AVG(score), MAX(score), SUM(kills), '
+                  "AVG(outcome = 'won'), AVG(frame_avg), AVG(frame_p99)")
+
+    summary = connection.execute("SELECT 'all', %s FROM sessions %s" % (aggregates, where), parameters).fetchone()
+    groups = connection.execute('SELECT %s AS grouping, %s FROM sessions %s GROUP BY grouping ORDER BY grouping'
+                                % (GROUPS[by], aggregates, where), parameters).fetchall()
+    best = connection.execute('SELECT %s FROM sessions %s ORDER BY score DESC, started LIMIT ?'
+                              % (', '.join(COLUMNS), where), parameters + (top,)).fetchall()
+    return summary, groups, best
+
+
+# print the report from the command line
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="High scores and telemetry of the played games of Space Invaders.")
+    parser.add_argument("--database", default=DATABASE, help="SQLite database of the sessions")
+    parser.add_argument("--by", choices=sorted(GROUPS), default='day', help="grouping of the sessions")
+    parser.add_argument("--days", type=float, help="only the sessions of the given number of last days")
+    parser.add_argument("--top", type=int, default=10, help="number of the best scores")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.database):
+        sys.exit("No sessions recorded in %s" % args.database)
+    connection = connect(args.database)
+    summary, groups, best = report(connection, args.by, args.days, args.top)
+    connection.close()
+
+    def formatValue(value, format):
+        return '-' if value is None else format % value
+
+    print("%-12s %8s %7s %9s %6s %7s %5s %9s %9s" % (args.by, 'sessions', 'hours', 'avg score', 'best', 'kills',
+                                                      'wins', 'frame avg', 'frame p99'))
+    for row in groups + [summary]:
+        if not row[1]:
+            continue
+        print("%-12s %8d %7.2f %9.1f %6d %7d %4.0f%% %9s %9s" % (row[0], row[1], row[2], row[3], row[4], row[5],
+                                                               row[6] * 100, formatValue(row[7], '%.1f ms'),
+                                                               formatValue(row[8], '%.1f ms')))
+
+    if not best:
+        sys.exit()
+    print()
+    print("%-4s %-19s %6s %8s %6s %5s %-5s" % ('rank', 'started', 'score', 'duration', 'kills', 'wave', 'outcome'))
+    for rank, row in enumerate(best, 1):
+        values = dict(zip(COLUMNS, row))
+        print("%-4d %-19s %6d %7.1fs %6d %5d %-5s" % (rank, time.strftime('%Y-%m-%d %H:%M:%S',
+                                                                           time.localtime(values['started'])),
+                                                      values['score'], values['duration'], values['kills'],
+                                                      values['wave'] + 1, values['outcome']))
@@ -0,0 +1,223 @@
+'''
+Parameter sweep of the headless engine for balancing the game.
+Runs many games for every combination of the given alien speeds, laser speeds, ship speeds, numbers of aliens
+in a row and fire cooldowns, played by random or scripted policies, in parallel on a pool of processes.
+Every game is streamed into a CSV file (gzipped when the name ends with .gz) as soon as its batch finishes,
+and the averages of the score, survival time, kill rate and accuracy of every combination are printed at the end.
+
+Usage:
+    python sweep.py --alien-speed 24 36 48 --num-aliens 5 7 9 --games 50 --output sweep.csv.gz
+    python sweep.py --policy scripted random --fire-cooldown 0.5 1.0 --workers 8
+'''
+
+# import libraries
+import argparse, csv, gzip, itertools, os, random, sys, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+# import the headless engine and its default settings
+from engine import GameEngine, ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_FIRE, EVENT_SHOT, \
+    EVENT_ALIEN_KILLED, ALIEN_SPEED, LASER_SPEED, SHIP_SPEED, FIRE_COOLDOWN, SHIP_WIDTH, randomActions
+from formation import Waves, NUM_ALIENS
+from world import ALIEN_SIZE
+
+# tunable settings of the engine, in the order of the columns of the output
+PARAMETERS = ('alien_speed', 'laser_speed', 'ship_speed', 'num_aliens', 'fire_cooldown')
+# columns of the output
+COLUMNS = PARAMETERS + ('policy', 'seed', 'score', 'ticks', 'seconds', 'kills', 'shots', 'won')
+# default maximum number of ticks of one game (10 minutes of game time)
+MAX_TICKS = 36000
+# number of games run by one task of the pool
+BATCH = 10
+
+
+def randomPolicy(engine, rng):
+    '''
+    Policy of random actions.
+    '''
+    return randomActions(rng)
+
+
+def scriptedPolicy(engine, rng):
+    '''
+    Policy moving the ship under the lowest alien and shooting when the ship is below it.
+    '''
+
+    aliens = engine.getWorld().getAliens()
+    slots = aliens.getAliveSlots()
+    if len(slots) == 0:
+        return ACTION_NONE
+    # the lowest alien is the most dangerous one
+    target = slots[aliens.y[slots].argmax()]
+    dx = (aliens.x[target] + ALIEN_SIZE / 2.0) - (engine.getShip().x + SHIP_WIDTH / 2.0)
+    if dx < -ALIEN_SIZE / 4.0:
+        return ACTION_LEFT | ACTION_FIRE * (dx > -ALIEN_SIZE / 2.0)
+    if dx > ALIEN_SIZE / 4.0:
+        return ACTION_RIGHT | ACTION_FIRE * (dx < ALIEN_SIZE / 2.0)
+    return ACTION_FIRE
+
+
+# policies by their names
+POLICIES = {
+    'random': randomPolicy,
+    'scripted': scriptedPolicy,
+}
+
+
+def createEngine(parameters):
+    '''
+    Function creating the engine with the given dictionary of PARAMETERS.
+    '''
+    return GameEngine(waves=Waves(numAliens=parameters['num_aliens']), alienSpeed=parameters['alien_speed'],
+                      laserSpeed=parameters['laser_speed'], shipSpeed=parameters['ship_speed'],
+                      fireCooldown=parameters['fire_cooldown'])
+
+
+def playGame(engine, policy, seed, maxTicks=MAX_TICKS):
+    '''
+    Function playing one game on the engine with the policy and the seed of its random numbers.
+    Returns the dictionary with the score, ticks, seconds of game time, kills, shots and the outcome.
+    '''
+
+    rng = random.Random(seed)
+    engine.reset()
+    kills = 0
+    shots = 0
+    while not engine.isOver() and engine.getTick() < maxTicks:
+        for event in engine.step(policy(engine, rng)):
+            if event == EVENT_ALIEN_KILLED:
+                kills += 1
+            elif event == EVENT_SHOT:
+                shots += 1
+    return {'score': engine.getScore(), 'ticks': engine.getTick(),
+            'seconds': round(engine.getTick() / float(engine.getTickRate()), 3), 'kills': kills, 'shots': shots,
+            'won': int(engine.hasWon())}
+
+
+def runBatch(parameters, policy, seeds, maxTicks=MAX_TICKS):
+    '''
+    Function running the games of one task of the pool, one game per seed with the same settings and policy.
+    Returns the list of rows with the values of COLUMNS.
+    '''
+
+    engine = createEngine(parameters)
+    rows = []
+    for seed in seeds:
+        result = playGame(engine, POLICIES[policy], seed, maxTicks)
+        result.update(parameters)
+        result['policy'] = policy
+        result['seed'] = seed
+        rows.append([result[column] for column in COLUMNS])
+    return rows
+
+
+def createTasks(grid, policies, games, seed=0, batch=BATCH):
+    '''
+    Function creating the tasks of the sweep - every combination of the values in the grid
+    (dictionary of lists of values by the name of the parameter) with every policy, split into batches of games.
+    Returns the list of (parameters, policy, seeds) tuples.
+    '''
+
+    tasks = []
+    for values in itertools.product(*[grid[name] for name in PARAMETERS]):
+        parameters = dict(zip(PARAMETERS, values))
+        for policy in policies:
+            seeds = list(range(seed, seed + games))
+            for start in range(0, games, batch):
+                tasks.append((parameters, policy, seeds[start:start + batch]))
+    return tasks
+
+
+def openOutput(path):
+    '''
+    Function opening the output file for writing, gzipped when the name ends with .gz.
+    '''
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', newline='')
+    return open(path, 'w', newline='')
+
+
+def accumulate(groups, rows):
+    '''
+    Function adding the rows to the running totals of every combination of settings and policy,
+    a dictionary of [games, score, seconds, kills, shots, wins] lists by the key of the combination.
+    Only the totals are kept, so the rows of a sweep of any size need not stay in memory.
+    '''
+
+    for row in rows:
+        values = dict(zip(COLUMNS, row))
+        key = tuple(values[name] for name in PARAMETERS) + (values['policy'],)
+        group = groups.setdefault(key, [0, 0, 0.0, 0, 0, 0])
+        group[0] += 1
+        group[1] += values['score']
+        group[2] += values['seconds']
+        group[3] += values['kills']
+        group[4] += values['shots']
+        group[5] += values['won']
+    return groups
+
+
+def summarize(groups):
+    '''
+    Function averaging the running totals of every combination of settings and policy.
+    Returns the list of (key, games, score, seconds, kills per minute, accuracy, win rate) tuples sorted by the key.
+    '''
+
+    summary = []
+    for key in sorted(groups):
+        games, score, seconds, kills, shots, won = groups[key]
+        summary.append((key, games, score / float(games), seconds / games,
+                        kills * 60.0 / seconds if seconds else 0.0, kills / float(shots) if shots else 0.0,
+                        won / float(games)))
+    return summary
+
+
+# run the sweep from the command line
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parameter sweep of simulated games of Space Invaders.")
+    parser.add_argument("--alien-speed", type=float, nargs='+', default=[ALIEN_SPEED], help="pixels per second")
+    parser.add_argument("--laser-speed", type=float, nargs='+', default=[LASER_SPEED], help="pixels per second")
+    parser.add_argument("--ship-speed", type=float, nargs='+', default=[SHIP_SPEED], help="pixels per second")
+    parser.add_argument("--num-aliens", type=int, nargs='+', default=[NUM_ALIENS], help="aliens in a row")
+    parser.add_argument("--fire-cooldown", type=float, nargs='+', default=[FIRE_COOLDOWN], help="seconds")
+    parser.add_argument("--policy", nargs='+', choices=sorted(POLICIES), default=['random'],
+                        help="policies playing the games")
+    parser.add_argument("--games", type=int, default=20, help="games of every combination and policy")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS, help="maximum number of ticks of one game")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game, every game has its own")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of processes")
+    parser.add_argument("--output", default='sweep.csv', help="CSV file of all games (.gz for gzip)")
+    args = parser.parse_args()
+
+    grid = {'alien_speed': args.alien_speed, 'laser_speed': args.laser_speed, 'ship_speed': args.ship_speed,
+            'num_aliens': args.num_aliens, 'fire_cooldown': args.fire_cooldown}
+    tasks = createTasks(grid, args.policy, args.games, args.seed)
+    # running totals of every combination, the number of games and their ticks
+    groups = {}
+    games = 0
+    ticks = 0
+    start = time.perf_counter()
+
+    with openOutput(args.output) as file, ProcessPoolExecutor(args.workers) as pool:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        futures = [pool.submit(runBatch, parameters, policy, seeds, args.max_ticks)
+                   for parameters, policy, seeds in tasks]
+        # write the games of every batch as soon as it finishes
+        for done, future in enumerate(as_completed(futures), 1):
+            batch = future.result()
+            writer.writerows(batch)
+            file.flush()
+            accumulate(groups, batch)
+            games += len(batch)
+            ticks += sum(row[COLUMNS.index('ticks')] for row in batch)
+            print("\r%d/%d batches" % (done, len(futures)), end='', file=sys.stderr)
+    print(file=sys.stderr)
+
+    seconds = time.perf_counter() - start
+    print("%d games, %d ticks in %.1f s (%.0f ticks/s) with %d workers" % (games, ticks, seconds,
+                                                                          ticks / seconds, args.workers))
+    print("%-36s %-8s %6s %8s %8s %9s %8s %5s" % ('alien/laser/ship/aliens/cooldown', 'policy', 'games', 'score',
+                                                 'survived', 'kills/min', 'accuracy', 'wins'))
+    for key, played, score, survived, killRate, accuracy, wins in summarize(groups):
+        print("%-36s %-8s %6d %8.1f %7.1fs %9.1f %7.0f%% %4.0f%%" % ('/'.join('%g' % value for value in key[:-1]),
+                                                                    key[-1], played, score, survived, killRate,
+                                                                    accuracy * 100, wins * 100))
@@ -0,0 +1,8 @@
+'''
+Configuration of the tests - the modules of the game are in the directory above.
+'''
+
+# import libraries
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,101 @@
+'''
+Tests of the dirty-rectangle renderer - every frame drawn from the changed parts of the screen is the same
+as the frame drawn in full, also with translucent sprites and the areas of the sprite atlas.
+'''
+
+# import libraries
+import os, random
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+import pytest
+# import the renderer, the asset manager and the images of the atlas of the game
+from renderer import DirtyRenderer
+from assets import AssetManager
+from scenes import SPRITES, ALIEN_FRAMES
+
+# size of the screen
+SIZE = WIDTH, HEIGHT = 240, 180
+
+
+@pytest.fixture(scope='module')
+def screen():
+    pygame.display.init()
+    screen = pygame.display.set_mode(SIZE)
+    yield screen
+    pygame.display.quit()
+
+
+def makeBackground():
+    '''
+    Function creating a background with a pattern, so restoring the wrong part of it is visible.
+    '''
+    background = pygame.Surface(SIZE).convert()
+    for x in range(0, WIDTH, 8):
+        pygame.draw.line(background, (x % 256, 40, 255 - x % 256), (x, 0), (x, HEIGHT))
+    return background
+
+
+def makeImages():
+    '''
+    Function creating the images of the sprites - the areas of the atlas of the game and translucent surfaces.
+    '''
+    atlas = AssetManager().atlas(SPRITES, {'alien': ALIEN_FRAMES})
+    images = [(atlas.getSurface(), atlas.getArea(name)) for name in SPRITES + ALIEN_FRAMES]
+    for alpha in (60, 128, 200):
+        surface = pygame.Surface((40, 24), pygame.SRCALPHA)
+        surface.fill((255, 255, 255, alpha))
+        pygame.draw.circle(surface, (255, 0, 0, 255 - alpha), (20, 12), 10)
+        images.append((surface.convert_alpha(), None))
+    return images
+
+
+def fullFrame(background, sprites):
+    '''
+    Function drawing the background and all sprites of a frame on a new surface.
+    '''
+    frame = background.copy()
+    for sprite in sprites:
+        frame.blit(*sprite)
+    return frame
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_matches_full_redraw(screen, seed):
+    rng = random.Random(seed)
+    background = makeBackground()
+    images = makeImages()
+    renderer = DirtyRenderer(screen, background)
+
+    # random sprites, then in every frame move, add or remove a few of them
+    sprites = []
+    for _ in range(12):
+        surface, area = rng.choice(images)
+        sprites.append([surface, (rng.randrange(-20, WIDTH), rng.randrange(-20, HEIGHT)), area])
+    for _ in range(60):
+        for _ in range(rng.randint(0, 3)):
+            change = rng.random()
+            if change < 0.6 and sprites:
+                sprite = rng.choice(sprites)
+                sprite[1] = (sprite[1][0] + rng.randint(-6, 6), sprite[1][1] + rng.randint(-6, 6))
+            elif change < 0.8 or not sprites:
+                surface, area = rng.choice(images)
+                sprites.insert(rng.randint(0, len(sprites)),
+                               [surface, (rng.randrange(-20, WIDTH), rng.randrange(-20, HEIGHT)), area])
+            else:
+                sprites.pop(rng.randrange(len(sprites)))
+        frame = [tuple(sprite) if sprite[2] is not None else tuple(sprite[:2]) for sprite in sprites]
+        renderer.render(frame)
+        assert pygame.image.tobytes(screen, 'RGB') == pygame.image.tobytes(fullFrame(background, frame), 'RGB')
+
+
+def test_unchanged_sprite_over_moving_sprite(screen):
+    background = makeBackground()
+    images = makeImages()
+    renderer = DirtyRenderer(screen, background)
+    laser, ship = images[SPRITES.index('laser.png')], images[-2]
+
+    # the lower sprite moves under the unchanged translucent sprite
+    for y in range(40, 80, 4):
+        frame = [(laser[0], (100, y), laser[1]), (ship[0], (90, 60))]
+        renderer.render(frame)
+        assert pygame.image.tobytes(screen, 'RGB') == pygame.image.tobytes(fullFrame(background, frame), 'RGB')
@@ -0,0 +1,73 @@
+'''
+Tests of the replays - the variable length integers, the binary format and the checksum of the final state.
+'''
+
+# import libraries
+import random, pytest
+# import the replays and the headless engine
+from replay import Replay, ReplayError, writeVarint, readVarint, playback, HEADER
+from engine import GameEngine, randomActions
+
+
+def recordGame(seed, ticks=2000):
+    '''
+    Function recording a game of random actions on the headless engine.
+    '''
+    rng = random.Random(seed)
+    engine = GameEngine()
+    engine.reset()
+    replay = Replay(engine.getTickRate(), 720, 560)
+    while not engine.isOver() and engine.getTick() < ticks:
+        actions = randomActions(rng)
+        replay.record(engine.getTick(), actions)
+        engine.step(actions)
+    replay.finish(engine)
+    return replay
+
+
+@pytest.mark.parametrize('value', [0, 1, 0x7f, 0x80, 0x3fff, 0x4000, 123456789, 2 ** 40])
+def test_varint_round_trip(value):
+    buffer = bytearray(b'x')
+    writeVarint(buffer, value)
+    assert readVarint(buffer, 1) == (value, len(buffer))
+
+
+def test_varint_truncated():
+    buffer = bytearray()
+    writeVarint(buffer, 300)
+    with pytest.raises(ReplayError):
+        readVarint(buffer[:-1], 0)
+
+
+def test_bytes_round_trip():
+    replay = recordGame(1)
+    decoded = Replay.fromBytes(replay.toBytes())
+    assert (decoded.tickRate, decoded.width, decoded.height) == (replay.tickRate, replay.width, replay.height)
+    assert decoded.ticks == replay.ticks
+    assert decoded.checksum == replay.checksum
+    assert decoded.actions == replay.actions
+
+
+def test_playback_reproduces_checksum():
+    for seed in range(3):
+        replay = Replay.fromBytes(recordGame(seed).toBytes())
+        result = playback(replay)
+        assert result['ticks'] == replay.ticks
+        assert result['engine'].checksum() == replay.checksum
+
+
+def test_playback_detects_changed_actions():
+    replay = recordGame(4)
+    replay.actions = dict((tick, actions ^ 7) for tick, actions in replay.actions.items())
+    with pytest.raises(ReplayError):
+        playback(replay)
+
+
+def test_broken_files():
+    data = recordGame(5).toBytes()
+    with pytest.raises(ReplayError):
+        Replay.fromBytes(data[:HEADER.size - 1])
+    with pytest.raises(ReplayError):
+        Replay.fromBytes(b'XXXX' + data[4:])
+    with pytest.raises(ReplayError):
+        Replay.fromBytes(data[:4] + bytes([data[4] + 1]) + data[5:])
@@ -0,0 +1,55 @@
+'''
+Tests of the vectorized environment - every game of a batch follows the rules of the headless engine.
+'''
+
+# import libraries
+import random
+import numpy as np
+# import the vectorized environment, the headless engine and its settings
+from vecenv import VectorEnv
+from engine import GameEngine, ALIEN_SPEED, randomActions
+from formation import Waves
+
+# number of compared games
+GAMES = 60
+
+
+def compare(ticks, **settings):
+    '''
+    Function playing the same random games in a batch and on the engines for at most the given number of ticks
+    and comparing their states. Returns the array of the finished games of the batch.
+    '''
+
+    env = VectorEnv(GAMES, autoReset=False, **settings)
+    env.reset()
+    engines = [GameEngine(**settings) for _ in range(GAMES)]
+    rngs = [random.Random(seed) for seed in range(GAMES)]
+    for engine in engines:
+        engine.reset()
+
+    # the same random actions for the game in the batch and its engine
+    for _ in range(ticks):
+        if all(engine.isOver() for engine in engines):
+            break
+        actions = np.array([randomActions(rng) for rng in rngs])
+        for engine, action in zip(engines, actions):
+            if not engine.isOver():
+                engine.step(int(action))
+        env.step(actions)
+
+    for game, engine in enumerate(engines):
+        assert (env.score[game], env.tick[game], env.over[game], env.won[game], env.wave[game],
+                env.alienAlive[game].sum()) == \
+            (engine.getScore(), engine.getTick(), engine.isOver(), engine.hasWon(), engine.getFormation().getWave(),
+             engine.getWorld().getAliens().getAliveCount()), "game %d" % game
+    return env.over
+
+
+def test_matches_engine():
+    compare(1500)
+
+
+def test_matches_engine_until_game_over():
+    # shorter waves of faster aliens, so every game ends within a few thousand ticks
+    over = compare(10000, waves=Waves(rows=3, waves=2), alienSpeed=ALIEN_SPEED * 3)
+    assert over.all()
@@ -0,0 +1,152 @@
+'''
+Text rendering of the game.
+Rendered texts are kept in a cache by (font, text, color), so the same text is rendered only once.
+Numbers that change often (the score) are put together from pre-rendered glyphs of the digits
+and are put together again only when their value changes.
+'''
+
+# import libraries
+import pygame
+from collections import OrderedDict
+
+# maximum number of rendered texts kept in the cache
+CACHE_SIZE = 128
+# characters pre-rendered in the glyph atlas
+DIGITS = '0123456789'
+
+
+class TextCache(object):
+    '''
+    Cache of rendered texts with least recently used eviction.
+    '''
+
+    # constructor
+    def __init__(self, size=CACHE_SIZE):
+        # maximum number of rendered texts
+        self._size = size
+        # rendered texts ordered from the least to the most recently used
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        '''
+        Method for getting the rendered text, the text is rendered only when it is not in the cache.
+        Takes the same parameters as pygame.font.Font.render, the background is always transparent.
+        '''
+
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            # mark the text as the most recently used
+            self._surfaces.move_to_end(key)
+            return surface
+
+        surface = font.render(text, antialias, color, None)
+        self._surfaces[key] = surface
+        # remove the least recently used text when the cache is full
+        if len(self._surfaces) > self._size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        '''
+        Method for removing all rendered texts.
+        '''
+        self._surfaces.clear()
+
+
+class GlyphAtlas(object):
+    '''
+    Glyphs of a set of characters pre-rendered with one font and color next to each other on one surface.
+    Texts made only of these characters are put together by blitting parts of the atlas, without rendering the font.
+    '''
+
+    # constructor
+    def __init__(self, font, color, characters=DIGITS, antialias=True):
+        # font, color and antialiasing used for characters outside of the atlas
+        self._font = font
+        self._color = color
+        self._antialias = antialias
+        # height of the line
+        self._height = font.get_height()
+
+        # render the glyphs and place them next to each other on the atlas
+        glyphs = [(character, font.render(character, antialias, color, None)) for character in characters]
+        width = sum(glyph.get_width() for character, glyph in glyphs)
+        self._atlas = pygame.Surface((max(width, 1), self._height), pygame.SRCALPHA)
+        # area of every character on the atlas
+        self._rects = {}
+        x = 0
+        for character, glyph in glyphs:
+            self._rects[character] = self._atlas.blit(glyph, (x, 0))
+            x += glyph.get_width()
+
+    def getHeight(self):
+        '''
+        Getter for the height of the put together texts.
+        '''
+        return self._height
+
+    def render(self, text):
+        '''
+        Method for putting together the text from the glyphs.
+        Characters missing in the atlas are rendered with the font.
+        '''
+
+        # source surface and area of every character
+        parts = []
+        for character in text:
+            rect = self._rects.get(character)
+            if rect is not None:
+                parts.append((self._atlas, rect))
+            else:
+                glyph = self._font.render(character, self._antialias, self._color, None)
+                parts.append((glyph, glyph.get_rect()))
+
+        # create a transparent surface for the whole text and blit the glyphs next to each other in one call
+        width = sum(rect.width for source, rect in parts)
+        surface = pygame.Surface((max(width, 1), self._height), pygame.SRCALPHA)
+        x = 0
+        blits = []
+        for source, rect in parts:
+            blits.append((source, (x, 0), rect))
+            x += rect.width
+        surface.blits(blits, doreturn=False)
+        return surface
+
+
+class NumberLabel(object):
+    '''
+    Label made of a static text (e.g. 'SCORE: ') and a number.
+    The static text comes from the text cache and the number from the glyph atlas. The label is put together
+    only when the number changes, otherwise the same surface is returned, so drawing it costs almost nothing.
+    '''
+
+    # constructor
+    def __init__(self, font, prefix, color, cache):
+        # rendered static text
+        self._prefix = cache.render(font, prefix, color)
+        # glyphs of the digits
+        self._atlas = GlyphAtlas(font, color)
+        # last shown number and its surface
+        self._value = None
+        self._surface = None
+
+    def render(self, value):
+        '''
+        Method for getting the surface of the label showing the given number.
+        '''
+
+        # the number did not change, reuse the surface
+        if value == self._value:
+            return self._surface
+
+        number = self._atlas.render(str(value))
+        width = self._prefix.get_width() + number.get_width()
+        height = max(self._prefix.get_height(), number.get_height())
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.blit(self._prefix, (0, 0))
+        surface.blit(number, (self._prefix.get_width(), 0))
+
+        self._value = value
+        self._surface = surface
+        return surface
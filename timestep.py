@@ -0,0 +1,89 @@
+'''
+Fixed timestep used to run the simulation of the game at a constant rate,
+independently of how fast the frames are drawn.
+'''
+
+# tick rate of the simulation in ticks per second
+TICK_RATE = 60
+# maximum number of drawn frames per second (0 = not limited)
+MAX_FPS = 120
+# longest frame time (in seconds) that is simulated at once,
+# protects the game from spiralling when a frame takes too long (window dragged, debugger...)
+MAX_FRAME_TIME = 0.25
+
+
+class FixedTimestep(object):
+    '''
+    Accumulator for the fixed timestep loop.
+    Collects the real time that passed between frames and converts it into a whole number of simulation ticks.
+    The time left over in the accumulator is exposed as alpha, the fraction of the next tick, which is used
+    for interpolating positions between two ticks when drawing.
+    '''
+
+    # constructor
+    def __init__(self, tickRate=TICK_RATE, maxFrameTime=MAX_FRAME_TIME):
+        # check the tick rate, simulation cannot run zero or negative number of ticks per second
+        if tickRate <= 0:
+            raise ValueError("tick rate has to be a positive number")
+
+        # number of ticks per second
+        self._tickRate = tickRate
+        # length of one tick in seconds
+        self._dt = 1.0 / tickRate
+        # longest frame time that is simulated at once
+        self._maxFrameTime = maxFrameTime
+        # time collected but not yet simulated
+        self._accumulator = 0.0
+        # number of ticks simulated since the last reset
+        self._ticks = 0
+
+    def getTickRate(self):
+        '''
+        Getter for the tick rate returning the number of ticks per second.
+        '''
+        return self._tickRate
+
+    def getDt(self):
+        '''
+        Getter for the length of one tick in seconds.
+        '''
+        return self._dt
+
+    def getTicks(self):
+        '''
+        Getter for the number of ticks simulated since the last reset.
+        '''
+        return self._ticks
+
+    def reset(self):
+        '''
+        Method for resetting the accumulator, e.g. when a new game starts.
+        '''
+        self._accumulator = 0.0
+        self._ticks = 0
+
+    def advance(self, elapsed):
+        '''
+        Method for adding the real time (in seconds) that passed since the last frame.
+        Returns the number of ticks that have to be simulated in this frame.
+        '''
+
+        # clamp the elapsed time so that a long hitch does not freeze the game with hundreds of ticks
+        if elapsed > self._maxFrameTime:
+            elapsed = self._maxFrameTime
+        # collect the elapsed time
+        self._accumulator += elapsed
+
+        # count whole ticks in the accumulator and keep only the remainder
+        steps = int(self._accumulator / self._dt)
+        self._accumulator -= steps * self._dt
+        self._ticks += steps
+
+        return steps
+
+    def getAlpha(self):
+        '''
+        Method for getting the interpolation factor between the previous and the current tick.
+        0 means the state of the previous tick, 1 the state of the current tick.
+        '''
+        return min(self._accumulator / self._dt, 1.0)
@@ -0,0 +1,335 @@
+'''
+Vectorized environment for training bots.
+Runs N independent games in lockstep. The state of all games is stored in batched NumPy arrays - one row per game
+for the ship, the formation of aliens and the laser projectiles - and one step() advances all games with
+a fixed number of array operations, without a Python loop over the games, so the cost of a step per game
+shrinks as the batch grows. The rules are the rules of GameEngine (movement, waves, shooting, collisions, score).
+Observations and rewards are NumPy arrays, frames can be rasterized into small grayscale arrays without SDL.
+
+Usage:
+    env = VectorEnv(64)
+    observations = env.reset()
+    while True:
+        observations, rewards, dones = env.step(np.random.randint(0, 8, 64))
+'''
+
+# import libraries
+import math, time
+import numpy as np
+# import the settings of the engine
+from engine import WIDTH, HEIGHT, ALIEN_SPEED, LASER_SPEED, SHIP_SPEED, FIRE_COOLDOWN, SHIP_X, SHIP_Y, SHIP_WIDTH, \
+    LASER_OFFSET_X, LASER_OFFSET_Y, POINTS, ACTION_LEFT, ACTION_RIGHT, ACTION_FIRE
+from timestep import TICK_RATE
+# import the waves and the layout of the formation
+from formation import Waves, TOP, ROW_HEIGHT, ROW_FILL
+from world import ALIEN_SIZE
+
+# values of the pixels of the rasterized frames
+ALIEN_PIXEL = 255
+SHIP_PIXEL = 170
+LASER_PIXEL = 85
+# default number of screen pixels per pixel of the rasterized frames
+FRAME_SCALE = 8
+
+
+class VectorEnv(object):
+    '''
+    N games of Space Invaders stepped together.
+    Aliens of a wave have fixed slots (row of the wave times the number of aliens in a row plus the column),
+    laser projectiles use the first free one of a few slots.
+    Finished games start again automatically when autoReset is True, step() still reports them as done.
+    '''
+
+    # constructor
+    def __init__(self, numEnvs, width=WIDTH, height=HEIGHT, tickRate=TICK_RATE, waves=None,
+                 alienSpeed=ALIEN_SPEED, laserSpeed=LASER_SPEED, shipSpeed=SHIP_SPEED,
+                 fireCooldown=FIRE_COOLDOWN, autoReset=True):
+        # number of games, size of the playing field and automatic restart of finished games
+        self._n = numEnvs
+        self._width = width
+        self._height = height
+        self._autoReset = autoReset
+        # speeds converted from pixels per second to pixels per tick
+        self._alienSpeed = alienSpeed / tickRate
+        self._laserSpeed = laserSpeed / tickRate
+        self._shipSpeed = shipSpeed / tickRate
+        # number of ticks between two shots
+        self._fireCooldown = int(round(fireCooldown * tickRate))
+        # settings and budgets of the waves of aliens
+        self._waves = Waves() if waves is None else waves
+        # distance between two aliens in a row, as in Formation
+        self._spacing = min(ROW_HEIGHT, width * ROW_FILL / self._waves.numAliens)
+        # maximum allowed value for y coordinate of an alien
+        self._maxY = height - 80
+
+        # slots of the aliens of one wave and of the laser projectiles that can fly at once
+        self._numAliens = self._waves.rows * self._waves.numAliens
+        lifetime = int(math.ceil((SHIP_Y + LASER_OFFSET_Y) / self._laserSpeed)) + 1
+        self._numLasers = lifetime // (self._fireCooldown + 1) + 1
+
+        n, a, l = self._n, self._numAliens, self._numLasers
+        # ship, shooting, score and the state of every game
+        self.shipX = np.zeros(n)
+        self.lastShot = np.zeros(n, dtype=np.int64)
+        self.tick = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.over = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+        # formation of every game - wave, spawned rows of the wave and the shared change of x coordinates
+        self.wave = np.zeros(n, dtype=np.int64)
+        self.rowsSpawned = np.zeros(n, dtype=np.int64)
+        self.change = np.zeros(n)
+        # aliens and laser projectiles of every game
+        self.alienX = np.zeros((n, a))
+        self.alienY = np.zeros((n, a))
+        self.alienAlive = np.zeros((n, a), dtype=bool)
+        self.laserX = np.zeros((n, l))
+        self.laserY = np.zeros((n, l))
+        self.laserAlive = np.zeros((n, l), dtype=bool)
+
+        # x coordinates of the aliens in a row relative to the first one
+        self._offsets = np.arange(self._waves.numAliens) * self._spacing
+        # index of every game, used for picking one slot per game
+        self._rows = np.arange(n)
+
+    def getNumEnvs(self):
+        '''
+        Getter for the number of games.
+        '''
+        return self._n
+
+    def getObservationSize(self):
+        '''
+        Getter for the length of the observation of one game.
+        '''
+        return 2 + 3 * self._numAliens + 3 * self._numLasers
+
+    def reset(self, mask=None):
+        '''
+        Method for starting new games, all of them or the ones selected by the boolean mask.
+        Returns the observations of all games.
+        '''
+
+        mask = np.ones(self._n, dtype=bool) if mask is None else mask
+        self.shipX[mask] = SHIP_X
+        self.lastShot[mask] = -self._fireCooldown - 1
+        self.tick[mask] = 0
+        self.score[mask] = 0
+        self.over[mask] = False
+        self.won[mask] = False
+        self.wave[mask] = 0
+        self.rowsSpawned[mask] = 0
+        self.change[mask] = self._alienSpeed
+        self.alienAlive[mask] = False
+        self.laserAlive[mask] = False
+        self._spawnRows(mask)
+        return self.observe()
+
+    def _spawnRows(self, mask):
+        '''
+        Method for spawning the next rows of the current wave of the selected games within the budgets,
+        starting at the edge of the screen the formation moves away from, as in Formation.spawnRows().
+        '''
+
+        waves = self._waves
+        rows = np.minimum(waves.rowsPerSpawn, waves.rows - self.rowsSpawned)
+        alive = self.alienAlive.sum(axis=1)
+        mask = mask & (rows > 0) & (alive + rows * waves.numAliens <= waves.maxAlive)
+        if not mask.any():
+            return
+
+        games = np.flatnonzero(mask)
+        rows = rows[games]
+        # x coordinates of the new rows of every game
+        right = self.change[games] > 0
+        start = np.where(right, 1.0,
+                         self._width - waves.numAliens * self._spacing + (self._spacing - ALIEN_SIZE))
+        x = start[:, None] + self._offsets[None, :]
+        columns = np.arange(waves.numAliens)
+        # rows spawned at once share the height of one row, only a few rows are spawned at once
+        for row in range(int(rows.max())):
+            spawning = row < rows
+            g = games[spawning]
+            slots = (self.rowsSpawned[g] + row)[:, None] * waves.numAliens + columns[None, :]
+            self.alienX[g[:, None], slots] = x[spawning]
+            self.alienY[g[:, None], slots] = (TOP + row * ROW_HEIGHT / rows[spawning].astype(float))[:, None]
+            self.alienAlive[g[:, None], slots] = True
+        self.rowsSpawned[games] += rows
+
+    def step(self, actions):
+        '''
+        Method for running one tick of all games.
+        Takes the array of actions (ACTION_* flags) of every game.
+        Returns the arrays of observations, rewards (points scored in the tick) and done flags.
+        '''
+
+        actions = np.asarray(actions)
+        active = ~self.over
+        rewards = np.zeros(self._n, dtype=np.float32)
+        shipY = SHIP_Y
+
+        # move the ship while exactly one of the move actions is held
+        move = actions & (ACTION_LEFT | ACTION_RIGHT)
+        velocity = np.where(move == ACTION_LEFT, -self._shipSpeed,
+                            np.where(move == ACTION_RIGHT, self._shipSpeed, 0.0))
+        x = self.shipX + velocity
+        self.shipX = np.where(active & (x > 0) & (x + SHIP_WIDTH < self._width), x, self.shipX)
+
+        # shoot if the cooldown since the last shot has passed, into the first free slot
+        fire = active & (actions & ACTION_FIRE > 0) & (self.tick - self.lastShot > self._fireCooldown)
+        free = ~self.laserAlive
+        fire &= free.any(axis=1)
+        if fire.any():
+            games = np.flatnonzero(fire)
+            slots = free[games].argmax(axis=1)
+            self.laserX[games, slots] = self.shipX[games] + LASER_OFFSET_X
+            self.laserY[games, slots] = shipY + LASER_OFFSET_Y
+            self.laserAlive[games, slots] = True
+            self.lastShot[games] = self.tick[games]
+        self.tick += active
+
+        # games without aliens spawn the next rows, start the next wave or are won
+        empty = active & ~self.alienAlive.any(axis=1)
+        if empty.any():
+            rowsLeft = self.rowsSpawned < self._waves.rows
+            self._spawnRows(empty & rowsLeft)
+            nextWave = empty & ~rowsLeft & (self.wave + 1 < self._waves.waves)
+            if nextWave.any():
+                self.wave[nextWave] += 1
+                self.rowsSpawned[nextWave] = 0
+                speed = self._alienSpeed * self._waves.speedup ** self.wave[nextWave]
+                self.change[nextWave] = np.where(self.change[nextWave] > 0, speed, -speed)
+                self._spawnRows(nextWave)
+            won = empty & ~rowsLeft & ~nextWave
+            self.over |= won
+            self.won |= won
+            active &= ~won
+
+        # move the laser projectiles upwards and remove the ones out of the screen
+        self.laserY -= self._laserSpeed * active[:, None]
+        self.laserAlive &= self.laserY > 0
+
+        # move the formations, at the edges of the screen move them a row lower, turn them and spawn the next rows
+        alive = self.alienAlive
+        left = np.where(alive, self.alienX, np.inf).min(axis=1)
+        right = np.where(alive, self.alienX, -np.inf).max(axis=1)
+        within = (left > 0) & (right + ALIEN_SIZE + self.change < self._width)
+        edge = active & ~within
+        self.alienY += (ROW_HEIGHT * edge)[:, None]
+        self.change = np.where(edge, -self.change, self.change)
+        self.alienX += (self.change * active)[:, None]
+        self._spawnRows(edge)
+
+        # collisions of the aliens (after their next move) with the laser projectiles,
+        # every laser projectile destroys the first alien it hits
+        predicted = self.alienX + self.change[:, None]
+        limit = ALIEN_SIZE * ALIEN_SIZE
+        killed = np.zeros(self._n, dtype=np.int64)
+        for slot in range(self._numLasers):
+            dx = predicted - self.laserX[:, slot:slot + 1]
+            dy = self.alienY - self.laserY[:, slot:slot + 1]
+            hits = (dx * dx + dy * dy < limit) & self.alienAlive & (self.laserAlive[:, slot] & active)[:, None]
+            hit = hits.any(axis=1)
+            if hit.any():
+                games = np.flatnonzero(hit)
+                self.alienAlive[games, hits[games].argmax(axis=1)] = False
+                self.laserAlive[games, slot] = False
+                killed += hit
+        self.score += POINTS * killed
+        rewards += POINTS * killed
+
+        # collision of an alien with the ship ends the game
+        dx = predicted - self.shipX[:, None]
+        dy = self.alienY - shipY
+        self.over |= active & ((dx * dx + dy * dy < limit) & self.alienAlive).any(axis=1)
+
+        # remove aliens that reached the set border of the screen
+        self.alienAlive &= self.alienY <= self._maxY
+
+        # report the finished games and start them again
+        dones = self.over.copy()
+        if self._autoReset and dones.any():
+            self.reset(dones)
+        return self.observe(), rewards, dones
+
+    def observe(self):
+        '''
+        Method for getting the observations of all games as one float32 array with a row per game -
+        the x coordinate of the ship, whether it can shoot, and the x, y and alive flag of every alien
+        and laser projectile slot, the coordinates divided by the width and height of the screen.
+        '''
+
+        n = self._n
+        observation = np.empty((n, self.getObservationSize()), dtype=np.float32)
+        observation[:, 0] = self.shipX / self._width
+        observation[:, 1] = self.tick - self.lastShot > self._fireCooldown
+        a, l = self._numAliens, self._numLasers
+        column = 2
+        for x, y, alive, size in ((self.alienX, self.alienY, self.alienAlive, a),
+                                  (self.laserX, self.laserY, self.laserAlive, l)):
+            observation[:, column:column + size] = np.where(alive, x / self._width, 0.0)
+            observation[:, column + size:column + 2 * size] = np.where(alive, y / self._height, 0.0)
+            observation[:, column + 2 * size:column + 3 * size] = alive
+            column += 3 * size
+        return observation
+
+    def _raster(self, frames, x, y, alive, width, height, value, scale):
+        '''
+        Method for drawing rectangles of the given size at the coordinates of the alive entities into the frames.
+        '''
+
+        games, slots = np.nonzero(alive)
+        if len(games) == 0:
+            return
+        rows, columns = frames.shape[1:]
+        w = max(int(round(width / float(scale))), 1)
+        h = max(int(round(height / float(scale))), 1)
+        # pixel coordinates of every pixel of every rectangle
+        px = (x[games, slots] / scale).astype(np.int64)[:, None, None] + np.arange(w)[None, None, :]
+        py = (y[games, slots] / scale).astype(np.int64)[:, None, None] + np.arange(h)[None, :, None]
+        px, py = np.broadcast_arrays(px, py)
+        g = np.broadcast_to(games[:, None, None], px.shape)
+        inside = (px >= 0) & (px < columns) & (py >= 0) & (py < rows)
+        frames[g[inside], py[inside], px[inside]] = value
+
+    def render(self, scale=FRAME_SCALE):
+        '''
+        Method for rasterizing all games into uint8 grayscale frames of the given number of screen pixels
+        per pixel, without SDL. Returns the array of shape (games, height / scale, width / scale).
+        '''
+
+        frames = np.zeros((self._n, self._height // scale, self._width // scale), dtype=np.uint8)
+        self._raster(frames, self.laserX, self.laserY, self.laserAlive, 5, 20, LASER_PIXEL, scale)
+        ship = np.ones((self._n, 1), dtype=bool)
+        self._raster(frames, self.shipX[:, None], np.full((self._n, 1), SHIP_Y), ship & ~self.over[:, None],
+                     SHIP_WIDTH, 75, SHIP_PIXEL, scale)
+        self._raster(frames, self.alienX, self.alienY, self.alienAlive, ALIEN_SIZE, ALIEN_SIZE, ALIEN_PIXEL, scale)
+        return frames
+
+
+# measure the steps per second for a few batch sizes
+if __name__ == "__main__":
+    # import libraries needed only for the command line
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Speed of the vectorized environment of Space Invaders.")
+    parser.add_argument("--envs", type=int, nargs='+', default=[1, 16, 256, 4096], help="batch sizes")
+    parser.add_argument("--steps", type=int, default=1000, help="steps of every batch")
+    parser.add_argument("--render", action='store_true', help="rasterize the frames after every step")
+    args = parser.parse_args()
+
+    for numEnvs in args.envs:
+        env = VectorEnv(numEnvs)
+        env.reset()
+        rng = np.random.default_rng(0)
+        finished = 0
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            observations, rewards, dones = env.step(rng.integers(0, 8, numEnvs))
+            finished += int(dones.sum())
+            if args.render:
+                env.render()
+        seconds = time.perf_counter() - start
+        print("%6d envs: %8.1f steps/s, %10.0f game ticks/s, %6.2f us per game tick, %d games finished"
+              % (numEnvs, args.steps / seconds, numEnvs * args.steps / seconds,
+                 seconds / (numEnvs * args.steps) * 1e6, finished))
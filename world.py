@@ -0,0 +1,177 @@
+'''
+World of the game stored as a structure of arrays.
+Positions, speeds and alive flags of all aliens and laser projectiles are kept in NumPy arrays,
+so moving, border checks, moving down, collisions and culling run as one batched operation per tick
+instead of a method call per object.
+The entities live in the pooled slots of EntityPool (see entities.py), removed entities stop being alive
+right away and their slots are freed at once by flush() at the end of the tick.
+'''
+
+# import libraries
+import numpy as np
+# import the collision detection
+from collision import SweepAndPrune, resolvePairs
+# import the entity manager
+from entities import EntityPool, CAPACITY
+
+# size of an alien in pixels
+ALIEN_SIZE = 40
+# space between two aliens in pixels
+SPACE_BETWEEN = 30
+
+
+class World(object):
+    '''
+    World of the game holding the pools of aliens and laser projectiles.
+    Contains the batched versions of the methods of AlienState and LaserState.
+    '''
+
+    # constructor
+    def __init__(self, width, height, capacity=CAPACITY):
+        # maximum allowed value for x coordinate of an alien
+        self._maxX = width
+        # maximum allowed value for y coordinate of an alien (aliens cannot go below the ship)
+        self._maxY = height - 80
+        # size of an alien and the space between two aliens
+        self._size = ALIEN_SIZE
+        self._spaceBetween = SPACE_BETWEEN
+
+        # collision detection between aliens and laser projectiles
+        self._collision = SweepAndPrune(ALIEN_SIZE)
+
+        # pools of entities
+        self._aliens = EntityPool(capacity)
+        self._lasers = EntityPool(capacity)
+
+    def getAliens(self):
+        '''
+        Getter for the pool of aliens.
+        '''
+        return self._aliens
+
+    def getLasers(self):
+        '''
+        Getter for the pool of laser projectiles.
+        '''
+        return self._lasers
+
+    def getCollisionChecks(self):
+        '''
+        Getter for the number of alien/laser pairs checked by the narrow phase in the last tick.
+        '''
+        return self._collision.getChecks()
+
+    def clear(self):
+        '''
+        Method for removing all aliens and laser projectiles.
+        '''
+        self._aliens.clear()
+        self._lasers.clear()
+
+    def savePositions(self):
+        '''
+        Method for storing the current coordinates of all entities as the coordinates of the previous tick.
+        '''
+        self._aliens.savePositions()
+        self._lasers.savePositions()
+
+    def flush(self):
+        '''
+        Method for freeing the slots of all aliens and laser projectiles removed during the tick,
+        called at the end of the tick.
+        '''
+        self._aliens.flush()
+        self._lasers.flush()
+
+    def addAlienRow(self, x, y, change):
+        '''
+        Method for adding a row of aliens with the given x coordinates, y coordinate and change of coordinates.
+        Returns the array of ids of the new aliens.
+        '''
+        return self._aliens.spawn(x, y, change)
+
+    def addLaser(self, x, y, change):
+        '''
+        Method for adding a laser projectile.
+        Returns the array with the id of the new laser projectile.
+        '''
+        return self._lasers.spawn(x, y, change)
+
+    def moveLasers(self):
+        '''
+        Method for 'shooting' all laser projectiles by decrementing their y coordinates.
+        '''
+        n = self._lasers.getCount()
+        self._lasers.y[:n] -= self._lasers.change[:n]
+
+    def cullLasers(self):
+        '''
+        Method for removing all laser projectiles that left the screen (y coordinate not higher than 0).
+        '''
+        n = self._lasers.getCount()
+        self._lasers.kill(self._lasers.y[:n] <= 0)
+
+    def moveAliens(self):
+        '''
+        Method for moving all aliens by their change of coordinates.
+        '''
+        n = self._aliens.getCount()
+        self._aliens.x[:n] += self._aliens.change[:n]
+
+    def moveAliensDown(self):
+        '''
+        Method for moving all aliens a row lower and changing their direction.
+        '''
+        n = self._aliens.getCount()
+        self._aliens.y[:n] += self._size + self._spaceBetween
+        self._aliens.change[:n] *= -1
+
+    def cullAliens(self):
+        '''
+        Method for removing all aliens that got below the set border of the screen.
+        '''
+        n = self._aliens.getCount()
+        self._aliens.kill(self._aliens.y[:n] > self._maxY)
+
+    def collideLasers(self):
+        '''
+        Method for handling the collisions between aliens and laser projectiles.
+        Every laser projectile can destroy only one alien. Hit aliens and used laser projectiles are marked as not alive.
+        Returns the number of destroyed aliens.
+        '''
+
+        aliens, lasers = self._aliens, self._lasers
+        # nothing can collide
+        if aliens.getAliveCount() == 0 or lasers.getAliveCount() == 0:
+            return 0
+
+        # only alive entities can collide
+        alienSlots = aliens.getAliveSlots()
+        laserSlots = lasers.getAliveSlots()
+
+        # find colliding pairs of aliens (after their next move) and laser projectiles
+        first, second = self._collision.findPairs(
+            aliens.x[alienSlots] + aliens.change[alienSlots], aliens.y[alienSlots],
+            lasers.x[laserSlots], lasers.y[laserSlots])
+        # no collision
+        if len(first) == 0:
+            return 0
+
+        # pair the aliens with the laser projectiles in the order of their ids (the order of spawning), so the result
+        # does not depend on the reuse of the slots, every one of them can be used once
+        order = np.lexsort((lasers.id[laserSlots[second]], aliens.id[alienSlots[first]]))
+        first, second = resolvePairs(first[order], second[order])
+
+        # despawn hit aliens and used laser projectiles at once
+        lasers.despawn(laserSlots[second])
+        return aliens.despawn(alienSlots[first])
+
+    def collidesWithShip(self, shipX, shipY):
+        '''
+        Method for checking whether any alien (after its next move) collides with the ship at the given coordinates.
+        '''
+        aliens = self._aliens
+        n = aliens.getCount()
+        dx = aliens.x[:n] + aliens.change[:n] - shipX
+        dy = aliens.y[:n] - shipY
+        return bool(np.any((dx * dx + dy * dy < self._size * self._size) & aliens.alive[:n]))